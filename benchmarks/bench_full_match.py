@@ -0,0 +1,90 @@
+'''
+bench_full_match: micro benchmark of the phrase classifier
+
+Compares Tokenizer._phrase_full_match with the plain regexp cascade it
+replaced, on the phrases of a synthetic corpus of every genre, and checks
+both give the same types:
+
+    python benchmarks/bench_full_match.py
+'''
+import os
+import sys
+import timeit
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from easy_tokenizer.patterns import Patterns  # noqa: E402
+from easy_tokenizer.tokenizer import Tokenizer  # noqa: E402
+from bench_tokenizer import GENRES, generate_corpus  # noqa: E402
+
+SI_UNITS_LIST = sorted(Patterns.si_units)
+
+
+def reference_full_match(phrase):
+    '''the classifier without set lookups and pre-checks'''
+    matched_type = None
+    if len(phrase) == 1:
+        matched_type = 'single_char'
+    elif phrase.isalpha():
+        matched_type = 'word'
+    elif phrase in SI_UNITS_LIST:
+        matched_type = 'unit'
+    elif Patterns.DIGITS_RE.fullmatch(phrase):
+        matched_type = 'digit'
+    elif Patterns.PARA_SEP_RE.fullmatch(phrase):
+        matched_type = 'punctuation_seq'
+    elif phrase[-1] == '.' and (
+            phrase[0].isupper() and phrase[:-1].isalpha() and
+            len(phrase[:-1]) < 4 or Patterns.ABBREV_RE.fullmatch(phrase)):
+        matched_type = 'abbreviation'
+    elif Patterns.ALL_WEB_RE.fullmatch(phrase):
+        matched_type = 'url/email'
+    return matched_type
+
+
+def get_phrases(size):
+    '''all sub phrases the tokenizer classifies on the corpus'''
+    phrases = []
+    tokenizer = Tokenizer(cache_size=0)
+    classify = tokenizer._phrase_full_match
+
+    def record(phrase):
+        phrases.append(phrase)
+        return classify(phrase)
+    tokenizer._phrase_full_match = record
+
+    for genre in GENRES:
+        if genre != 'unbroken':
+            tokenizer.tokenize(generate_corpus(genre, size))
+    return phrases
+
+
+def main():
+    '''run the micro benchmark'''
+    parser = ArgumentParser(description='benchmark the phrase classifier')
+    parser.add_argument('--size', type=int, default=100000,
+                        help='number of chars per corpus')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    phrases = get_phrases(args.size)
+    classify = Tokenizer()._phrase_full_match
+    for phrase in phrases:
+        assert classify(phrase) == reference_full_match(phrase), phrase
+
+    results = {}
+    for name, func in [('reference', reference_full_match),
+                       ('current', classify)]:
+        results[name] = min(timeit.repeat(
+            lambda: [func(phrase) for phrase in phrases],
+            number=1, repeat=args.repeat))
+        print('{:<10} {:>10.0f} ns/phrase'.format(
+            name, 1e9 * results[name] / len(phrases)))
+    print('speedup    {:>10.2f}x over {} phrases'.format(
+        results['reference'] / results['current'], len(phrases)))
+
+
+if __name__ == '__main__':
+    main()
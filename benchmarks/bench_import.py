@@ -0,0 +1,50 @@
+'''
+bench_import: import and cold start time of the tokenizer
+
+Every measure runs in a fresh interpreter, the best of several runs is
+kept:
+
+    python benchmarks/bench_import.py
+'''
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+CASES = {
+    'import': 'import easy_tokenizer.tokenizer',
+    'first tokenize': 'from easy_tokenizer.tokenizer import Tokenizer\n'
+                      'Tokenizer().tokenize("see http://www.foo.com, '
+                      '12.5% of 2019 e-mail")',
+    'cli module': 'import easy_tokenizer.__main__',
+}
+
+
+def time_code(code, repeat):
+    '''best wall time of code in a fresh interpreter, in seconds'''
+    timed_code = 'import time\n' \
+        'start = time.perf_counter()\n' \
+        '{}\n' \
+        'print(time.perf_counter() - start)'.format(code)
+    return min(
+        float(subprocess.run([sys.executable, '-c', timed_code],
+                             check=True, cwd=ROOT,
+                             stdout=subprocess.PIPE).stdout)
+        for _ in range(repeat))
+
+
+def main():
+    '''run the import benchmark'''
+    parser = ArgumentParser(description='benchmark the import time')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, code in CASES.items():
+        print('{:<16} {:>8.1f} ms'.format(
+            name, 1000 * time_code(code, args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+'''
+bench_tokenizer: throughput and memory benchmark of the Tokenizer
+
+Synthetic corpora of several genres are generated from a fixed seed, so
+the benchmark runs offline and is reproducible. Every case runs in its
+own process to get an isolated peak RSS, results are saved as JSON and
+can be compared with the results of another commit:
+
+    python benchmarks/bench_tokenizer.py -o new.json
+    python benchmarks/bench_tokenizer.py -o new.json --compare old.json
+'''
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from easy_tokenizer.tokenizer import Tokenizer  # noqa: E402
+
+GENRES = ('prose', 'web', 'digits', 'hyphen', 'unbroken')
+METHODS = ('tokenize', 'tokenize_with_pos_info', 'cli')
+
+WORDS = ['the', 'of', 'and', 'a', 'in', 'to', 'is', 'was', 'for', 'on',
+         'tokenizer', 'experience', 'développement', 'Python', 'data',
+         'années', 'project', 'team', 'B.V.', 'e.g.', 'Aug.', "l'agence",
+         'C++', 'Java/PHP', '(ex)', 'office(XP)', '"quoted"']
+
+
+def _prose(rand):
+    words = [rand.choice(WORDS) for _ in range(rand.randint(5, 25))]
+    for _ in range(rand.randint(0, 2)):
+        position = rand.randrange(len(words))
+        words[position] += ','
+    return ' '.join(words) + rand.choice(['.', '!', '?', '...'])
+
+
+def _web(rand):
+    number = rand.randint(1, 99999)
+    line = '2020-03-{:02d} 12:{:02d}:01 GET ' \
+        'http://www.site{}.com/p/{}?id={} user{}@mail.example.org ' \
+        'https://docs.example.com/d/{}/edit status=200'
+    return line.format(rand.randint(1, 28), rand.randint(0, 59),
+                       number, number, number, number, number)
+
+
+def _digits(rand):
+    row = '| {:.2f} | {:,} | {:.2f}% | {}st | ${:,}.99 | 10.000,{} |'
+    return row.format(
+        rand.uniform(0, 1000), rand.randint(0, 10 ** 7),
+        rand.uniform(0, 100), rand.randint(1, 9),
+        rand.randint(0, 10 ** 5), rand.randint(10, 99))
+
+
+def _hyphen(rand):
+    terms = ['self-driving', 'tcp-ip', 'multi-level', 'high-performance',
+             'state-of-the-art', 'e-mail', 'PME-PMI', 'HP-UX', 'ex-boss',
+             'C/C++/Java', 'real-time', 'x86-64', 'end-to-end']
+    return ' '.join(rand.choice(terms) for _ in range(rand.randint(5, 15)))
+
+
+def _unbroken(rand):
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' \
+        'abcdefghijklmnopqrstuvwxyz0123456789+/'
+    return ''.join(rand.choice(alphabet)
+                   for _ in range(rand.randint(200, 2000))) + '=='
+
+
+GENERATORS = {
+    'prose': _prose,
+    'web': _web,
+    'digits': _digits,
+    'hyphen': _hyphen,
+    'unbroken': _unbroken,
+}
+
+
+def generate_corpus(genre, size, seed=0):
+    '''generate about size chars of text of the given genre'''
+    rand = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = GENERATORS[genre](rand)
+        lines.append(line)
+        length += len(line) + 1
+    return '\n'.join(lines)
+
+
+def peak_rss_kb(who=resource.RUSAGE_SELF):
+    '''peak resident set size of this process or its children, in KB'''
+    rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KB on Linux
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def stage_timings(text, engine):
+    '''time spent in every tokenizer stage, in seconds'''
+    tokenizer = Tokenizer(engine=engine, collect_stats=True)
+    tokenizer.tokenize(text)
+    return {
+        'seconds': dict(tokenizer.stats.seconds),
+        'self_seconds': dict(tokenizer.stats.self_seconds),
+    }
+
+
+def run_case(genre, method, size, repeat, engine):
+    '''run one case in this process, output a dict of measurements'''
+    text = generate_corpus(genre, size)
+    if method == 'cli':
+        return run_cli_case(text, repeat)
+
+    best = None
+    for _ in range(repeat):
+        tokenizer = Tokenizer(engine=engine)
+        start = time.perf_counter()
+        tokens = getattr(tokenizer, method)(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    result = {
+        'chars': len(text),
+        'tokens': len(tokens),
+        'seconds': best,
+        'tokens_per_sec': len(tokens) / best if best else None,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    if method == 'tokenize':
+        result['stages'] = stage_timings(text, engine)
+    return result
+
+
+def run_cli_case(text, repeat):
+    '''time the easy_tokenizer script on a file, in a child process'''
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, 'input.txt')
+        output_file = os.path.join(tmp_dir, 'output.txt')
+        with open(input_file, 'w', encoding='utf-8') as input_f:
+            input_f.write(text)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, '-m', 'easy_tokenizer',
+                 '-f', input_file, '-o', output_file],
+                check=True, stdout=subprocess.DEVNULL,
+                cwd=os.path.join(os.path.dirname(__file__), os.pardir))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        with open(output_file, encoding='utf-8') as output_f:
+            nr_tokens = len(output_f.read().split())
+    return {
+        'chars': len(text),
+        'tokens': nr_tokens,
+        'seconds': best,
+        'tokens_per_sec': nr_tokens / best if best else None,
+        'peak_rss_kb': peak_rss_kb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_all(args):
+    '''run every case in a child process, collect the results'''
+    cases = {}
+    for genre in args.genres:
+        for method in args.methods:
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', genre, method,
+                 '--size', str(args.size), '--repeat', str(args.repeat),
+                 '--engine', args.engine],
+                check=True, stdout=subprocess.PIPE).stdout
+            case = '{}:{}'.format(genre, method)
+            cases[case] = json.loads(output)
+            print('{:<32} {:>12.0f} tokens/sec'.format(
+                case, cases[case]['tokens_per_sec']), file=sys.stderr)
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': args.size,
+        'engine': args.engine,
+        'cases': cases,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    '''print the throughput and memory change of every case'''
+    print('{:<32} {:>10} {:>10}'.format('case', 'speed', 'peak rss'))
+    for case, result in sorted(results['cases'].items()):
+        if case not in baseline['cases']:
+            continue
+        old = baseline['cases'][case]
+        print('{:<32} {:>+9.1f}% {:>+9.1f}%'.format(
+            case,
+            100.0 * (result['tokens_per_sec'] / old['tokens_per_sec'] - 1),
+            100.0 * (result['peak_rss_kb'] / old['peak_rss_kb'] - 1)))
+
+
+def get_args():
+    '''get arguments'''
+    parser = ArgumentParser(description='benchmark the tokenizer')
+    parser.add_argument('--size', type=int, default=200000,
+                        help='number of chars per corpus')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of runs per case, best one is kept')
+    parser.add_argument('--genres', nargs='+', default=GENRES,
+                        choices=GENRES)
+    parser.add_argument('--methods', nargs='+', default=METHODS,
+                        choices=METHODS)
+    parser.add_argument('--engine', default='cascade',
+                        choices=Tokenizer.ENGINES)
+    parser.add_argument('-o', '--output', help='JSON result file')
+    parser.add_argument('--compare', help='JSON result file to compare to')
+    parser.add_argument('--child', nargs=2, metavar=('GENRE', 'METHOD'),
+                        help='run a single case and print its JSON result')
+    return parser.parse_args()
+
+
+def main():
+    '''run the benchmark'''
+    args = get_args()
+    if args.child:
+        genre, method = args.child
+        json.dump(run_case(genre, method, args.size, args.repeat,
+                           args.engine), sys.stdout)
+        return
+
+    results = run_all(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_f:
+            json.dump(results, output_f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_f:
+            compare(results, json.load(baseline_f))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,6 @@
 Top-level package for easy-tokenizer
 """
 import sys
-import logging
 
 __author__ = """Chao Li"""
 __email__ = 'chaoli.job@google.com'
@@ -13,9 +12,10 @@ name = "easy-tokenizer"
 
 def define_logger(mod_name):
     """Set the default logging configuration"""
+    import logging
     logger = logging.getLogger(mod_name)
     if not logger.handlers:
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = logging.StreamHandler(sys.stderr)
         console_handler.setFormatter(logging.Formatter(
             '%(levelname).1s [%(asctime)s] [%(name)s] %(message)s'))
         logger.addHandler(console_handler)
@@ -24,9 +24,20 @@ def define_logger(mod_name):
     return logger
 
 
-def set_logging_level(level=logging.WARN):
-    """Change logging level"""
-    LOGGER.setLevel(level)
+def set_logging_level(level=None):
+    """Change logging level, default as logging.WARN"""
+    if level is None:
+        import logging
+        level = logging.WARN
+    get_logger().setLevel(level)
 
 
-LOGGER = define_logger(__name__)
+_LOGGER = None
+
+
+def get_logger():
+    """The package logger, set up on first use, logging is slow to import"""
+    global _LOGGER
+    if _LOGGER is None:
+        _LOGGER = define_logger(__name__)
+    return _LOGGER
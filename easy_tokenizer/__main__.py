@@ -1,12 +1,18 @@
 '''
 easy_tokenize: script to tokenize a input file or input text
 '''
+import sys
+import json
 from argparse import ArgumentParser
-from . import LOGGER
+from collections import deque
+from . import get_logger
 from .tokenizer import Tokenizer
+from .parallel import imap_tokenize
+from .reader import is_regular_file, iter_chunks
+from .serialization import TokenWriter
 
 
-def get_args():
+def get_args(argv=None):
     '''get arguments'''
     parser = ArgumentParser(description='tokenize text', prog='PROG')
     input_args = parser.add_mutually_exclusive_group(required=True)
@@ -22,7 +28,202 @@ def get_args():
 
     parser.add_argument('-o', '--output', help='output file', type=str)
 
-    return parser.parse_args()
+    parser.add_argument('--format',
+                        help='output format, "text" for space separated '
+                             'tokens, "bin" for a binary token file with '
+                             'positions, default as text',
+                        choices=['text', 'bin'],
+                        default='text')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        help='tokenize the input file line by line with N '
+                             'processes, one output line per input line',
+                        type=int)
+
+    parser.add_argument('--jsonl',
+                        help='the input file has one JSON record per line, '
+                             'write each record back with its tokens',
+                        action='store_true')
+
+    parser.add_argument('--field',
+                        help='JSONL field with the text, default as "text"',
+                        default='text',
+                        type=str)
+
+    parser.add_argument('--output-field',
+                        help='JSONL field to write the tokens to, '
+                             'default as "tokens"',
+                        default='tokens',
+                        type=str)
+
+    parser.add_argument('--with-pos',
+                        help='in JSONL mode, write [token, start, end] '
+                             'instead of plain tokens',
+                        action='store_true')
+
+    parser.add_argument('--max-phrase-length',
+                        help='split phrases without whitespace longer than '
+                             'N chars in linear time, on word boundaries '
+                             'and hyphens only',
+                        type=int)
+
+    parser.add_argument('--stats',
+                        help='print per stage counters and time to STDERR',
+                        action='store_true')
+
+    args = parser.parse_args(argv)
+    if args.jsonl and not args.filename:
+        parser.error('--jsonl needs an input file')
+    if args.workers is not None:
+        if args.workers < 1:
+            parser.error('--workers should be at least 1')
+        if not args.filename:
+            parser.error('--workers needs an input file')
+    if args.format == 'bin' and (not args.output or args.jsonl or
+                                 args.workers):
+        parser.error('--format bin needs an output file, '
+                     'and can not be used with --jsonl or --workers')
+    return args
+
+
+def write_tokens(tokens, output_f):
+    '''write tokens space separated to output_f as they are produced'''
+    separator = ''
+    for token in tokens:
+        output_f.write(separator)
+        output_f.write(token)
+        separator = ' '
+
+
+def write_lines(token_lists, output_f):
+    '''write each token list as one space separated line'''
+    separator = ''
+    for tokens in token_lists:
+        output_f.write(separator)
+        write_tokens(tokens, output_f)
+        separator = '\n'
+
+
+class InvalidRecordError(ValueError):
+    '''a line of the JSONL input is not a record with a text field'''
+
+
+def read_record(line, line_number, field):
+    '''
+    decode one JSONL line
+
+    params:
+        - line: the line
+        - line_number: position of the line in the file, for errors
+        - field: field with the text, missing or null as an empty text
+    output:
+        - (record, text)
+    '''
+    try:
+        record = json.loads(line)
+    except ValueError as error:
+        raise InvalidRecordError(
+            'line {}: invalid JSON, {}'.format(line_number, error))
+    if not isinstance(record, dict):
+        raise InvalidRecordError(
+            'line {}: expected a JSON object, got {}'.format(
+                line_number, type(record).__name__))
+    text = record.get(field)
+    if text is None:
+        text = ''
+    elif not isinstance(text, str):
+        raise InvalidRecordError(
+            'line {}: field "{}" should be a string, got {}'.format(
+                line_number, field, type(text).__name__))
+    return record, text
+
+
+def tokenize_jsonl(args, tokenizer, output_f):
+    '''
+    tokenize the text field of every JSON record in the input file, write
+    the records with their tokens in the same order to output_f, raise
+    InvalidRecordError with the line number on a line that is not a JSON
+    object, or whose field is not a string
+    '''
+    # records waiting for their tokens, at most one block of the pool
+    records = deque()
+
+    def texts(input_f):
+        for line_number, line in enumerate(input_f, 1):
+            if not line.strip():
+                continue
+            record, text = read_record(line, line_number, args.field)
+            records.append(record)
+            yield text
+
+    with open(args.filename, "r", encoding="utf-8") as input_f:
+        if args.workers:
+            token_lists = imap_tokenize(tokenizer, texts(input_f),
+                                        args.workers,
+                                        with_pos=args.with_pos)
+        elif args.with_pos:
+            token_lists = ([(token.text, token.start, token.end)
+                            for token in tokenizer.tokenize_with_pos_info(
+                                text)]
+                           for text in texts(input_f))
+        else:
+            token_lists = (tokenizer.tokenize(text)
+                           for text in texts(input_f))
+
+        for tokens in token_lists:
+            record = records.popleft()
+            record[args.output_field] = tokens
+            output_f.write(json.dumps(record, ensure_ascii=False))
+            output_f.write('\n')
+
+
+def tokenize_file(tokenizer, filename):
+    '''
+    tokenize the input file lazily, a regular file is memory mapped, a pipe
+    or a device, e.g. /dev/stdin, is read in text mode chunk by chunk
+    '''
+    if is_regular_file(filename):
+        for token in tokenizer.tokenize_file(filename):
+            yield token
+        return
+    with open(filename, "r", encoding="utf-8") as input_f:
+        for token in tokenizer.tokenize_stream(iter_chunks(input_f)):
+            yield token
+
+
+def write_bin(args, tokenizer, output_f):
+    '''tokenize the string or file given in args into a binary token file'''
+    if args.filename:
+        get_logger().info('tokenize text file {} to binary'.format(
+            args.filename))
+        tokens = tokenize_file(tokenizer, args.filename)
+    else:
+        get_logger().info('tokenize input string to binary')
+        tokens = tokenizer.iter_tokens(args.string, with_pos=True)
+    with TokenWriter(output_f) as writer:
+        writer.write_all(tokens)
+
+
+def tokenize_input(args, tokenizer, output_f):
+    '''tokenize the string or file given in args, write tokens to output_f'''
+    if args.jsonl:
+        get_logger().info('tokenize JSONL file {}'.format(args.filename))
+        tokenize_jsonl(args, tokenizer, output_f)
+    elif args.filename and args.workers:
+        get_logger().info('tokenize lines of {} with {} workers'.format(
+            args.filename, args.workers))
+        with open(args.filename, "r", encoding="utf-8") as input_f:
+            write_lines(imap_tokenize(tokenizer, input_f, args.workers),
+                        output_f)
+    elif args.filename:
+        get_logger().info('tokenize text file {}'.format(args.filename))
+        write_tokens((token.text
+                      for token in tokenize_file(tokenizer, args.filename)),
+                     output_f)
+    elif args.string:
+        get_logger().info('tokenize input string')
+        write_tokens(tokenizer.tokenize(args.string), output_f)
 
 
 def main():
@@ -36,22 +237,53 @@ def main():
     - string: string to tokenize
 
     - output: output file, default as STDOUT
+
+    - format: 'text' for space separated tokens, 'bin' for a binary token
+      file with positions, see serialization, needs output
+
+    - workers: tokenize the input file line by line in N processes
+
+    - jsonl: the input file is JSONL, tokenize the text of each record,
+      see field, output_field and with_pos
+
+    - max_phrase_length: split longer phrases on word boundaries and
+      hyphens only, guards against very long unbroken strings
+
+    - stats: print per stage counters and time to STDERR
+
+    run "easy-tokenizer serve" to start the tokenizer server instead, see
+    server.main
     '''
+    if sys.argv[1:2] == ['serve']:
+        from .server import main as serve
+        serve(sys.argv[2:])
+        return
+
     args = get_args()
 
-    result = ''
-    tokenizer = Tokenizer()
-    if args.filename:
-        LOGGER.info('tokenize text file {}'.format(args.filename))
-        with open(args.filename, "r", encoding="utf-8") as input_f:
-            input_text = input_f.read()
-        result = tokenizer.tokenize(input_text)
-    elif args.string:
-        LOGGER.info('tokenize input string')
-        result = tokenizer.tokenize(args.string)
+    tokenizer = Tokenizer(collect_stats=args.stats,
+                          max_phrase_length=args.max_phrase_length)
+    if args.stats and args.workers:
+        get_logger().warning('--stats only covers this process, '
+                             'not the --workers processes')
+    try:
+        if args.format == 'bin':
+            with open(args.output, "wb") as output_f:
+                write_bin(args, tokenizer, output_f)
+        elif args.output:
+            with open(args.output, "w", encoding="utf-8") as output_f:
+                tokenize_input(args, tokenizer, output_f)
+        else:
+            tokenize_input(args, tokenizer, sys.stdout)
+            if not args.jsonl:
+                sys.stdout.write('\n')
+    except InvalidRecordError as error:
+        sys.exit('{}: {}'.format(args.filename, error))
 
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as output_f:
-            output_f.write(" ".join(result))
-    else:
-        print(" ".join(result))
+    if args.stats:
+        print(tokenizer.stats.report(tokenizer.cache_info()),
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+'''Helpers for the Python versions missing some str and asyncio methods'''
+import re
+
+if hasattr(str, 'isascii'):
+    isascii = str.isascii
+else:
+    _NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+    def isascii(text):
+        '''str.isascii, which Python 3.6 lacks'''
+        return _NON_ASCII_RE.search(text) is None
+
+
+def get_running_loop():
+    '''asyncio.get_running_loop, on 3.6 get_event_loop in a coroutine'''
+    # asyncio is slow to import, only load it for async callers
+    import asyncio
+    if hasattr(asyncio, 'get_running_loop'):
+        return asyncio.get_running_loop()
+    return asyncio.get_event_loop()
@@ -1,9 +1,92 @@
 '''Normalizer Functions'''
 
+import re
 import unicodedata
+from array import array
+from functools import lru_cache
+from ._compat import isascii
+
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+
+class _NonSpacingMarks(dict):
+    '''
+    translation table for str.translate removing non-spacing marks,
+    filled on demand with every code point met so far
+    '''
+    def __missing__(self, code_point):
+        if unicodedata.category(chr(code_point)) == 'Mn':
+            value = None
+        else:
+            value = code_point
+        self[code_point] = value
+        return value
+
+
+_NON_SPACING_MARKS = _NonSpacingMarks()
 
 
 def normalize_chars(text):
     "Decompose the unicode string s and remove non-spacing marks."
-    return ''.join(char for char in unicodedata.normalize('NFKD', text)
-                   if unicodedata.category(char) != 'Mn')
+    if isascii(text):
+        # ascii is already decomposed, and has no marks
+        return text
+    return unicodedata.normalize('NFKD', text).translate(_NON_SPACING_MARKS)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_char(char):
+    return unicodedata.normalize('NFKD', char).translate(_NON_SPACING_MARKS)
+
+
+def normalize_chars_with_offsets(text):
+    '''
+    normalize_chars, also output where each normalized char comes from.
+    Chars are decomposed one by one, which only differs from decomposing
+    the whole text in the order of consecutive combining marks.
+
+    params:
+        - text: string
+    output:
+        - (normalized, offsets): offsets is an array('l') with, for every
+          char of normalized, its position in text, plus len(text) at the
+          end, so a span [start:end] of normalized maps to
+          [offsets[start]:max(offsets[end - 1] + 1, offsets[end])] of
+          text, which covers the dropped chars, like combining marks,
+          between the last char of the span and the next one
+    '''
+    if isascii(text):
+        return text, array('l', range(len(text) + 1))
+
+    pieces = []
+    offsets = array('l')
+    position = 0
+    for match in _NON_ASCII_RE.finditer(text):
+        # ascii chars are kept as they are
+        pieces.append(text[position:match.start()])
+        offsets.extend(range(position, match.start()))
+        for position in range(match.start(), match.end()):
+            piece = _normalize_char(text[position])
+            if piece:
+                pieces.append(piece)
+                offsets.extend([position] * len(piece))
+        position = match.end()
+    pieces.append(text[position:])
+    offsets.extend(range(position, len(text) + 1))
+    return ''.join(pieces), offsets
+
+
+def normalize_batch(texts, with_offsets=False):
+    '''
+    normalize a batch of texts
+
+    params:
+        - texts: iterable of strings
+        - with_offsets: output (normalized, offsets) pairs as given by
+          normalize_chars_with_offsets instead of strings
+    output:
+        - a list with the normalized texts, in the same order
+    '''
+    if with_offsets:
+        return [normalize_chars_with_offsets(text) for text in texts]
+    return [normalize_chars(text) for text in texts]
@@ -0,0 +1,190 @@
+'''Helpers to run a Tokenizer in a pool of worker processes'''
+import mmap
+import os
+import stat
+from array import array
+from itertools import islice
+from .reader import iter_byte_ranges
+
+DEFAULT_CHUNKSIZE = 64
+
+# tokenizer of the current worker process, set by the pool initializer
+_WORKER_TOKENIZER = None
+
+
+def _init_worker(tokenizer):
+    global _WORKER_TOKENIZER
+    _WORKER_TOKENIZER = tokenizer
+
+
+def _tokenize(text):
+    return _WORKER_TOKENIZER.tokenize(text)
+
+
+def _tokenize_with_pos(text):
+    # plain tuples are much cheaper to send back than Token objects
+    return [(token.text, token.start, token.end)
+            for token in _WORKER_TOKENIZER.tokenize_with_pos_info(text)]
+
+
+def _decode_range(source, start, end):
+    '''
+    decode the utf-8 bytes [start:end] of source, a (kind, value) pair:
+    ('shared_memory', name), ('file', path) or ('bytes', data)
+    '''
+    kind, value = source
+    if kind == 'bytes':
+        return str(value[start:end], 'utf-8')
+    if kind == 'shared_memory':
+        from multiprocessing.shared_memory import SharedMemory
+        shared = SharedMemory(name=value)
+        try:
+            with shared.buf[start:end] as view:
+                return str(view, 'utf-8')
+        finally:
+            shared.close()
+    with open(value, 'rb') as input_f, \
+            mmap.mmap(input_f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view, view[start:end] as chunk_view:
+            return str(chunk_view, 'utf-8')
+
+
+def _tokenize_range(source, start, end):
+    # positions relative to the range, the parent adds the char offset
+    text = _decode_range(source, start, end)
+    texts = []
+    starts = array('l')
+    ends = array('l')
+    for token in _WORKER_TOKENIZER.tokenize_with_pos_info(text):
+        texts.append(token.text)
+        starts.append(token.start)
+        ends.append(token.end)
+    return len(text), texts, starts, ends
+
+
+def imap_tokenize_large(tokenizer, text_or_path, workers, chunk_size=None):
+    '''
+    tokenize one large document in a process pool, cut in ranges of utf-8
+    bytes ending on whitespace. A text is copied once into shared memory,
+    a file is memory mapped by every worker, the ranges themselves are
+    never pickled. Without multiprocessing.shared_memory, before Python
+    3.8, the bytes of each range are sent to the workers instead.
+
+    params:
+        - tokenizer: Tokenizer object
+        - text_or_path: string with the text, or os.PathLike of a utf-8
+          file
+        - workers: number of worker processes
+        - chunk_size: number of bytes per range, by default the document
+          is cut in about 4 ranges per worker, at least 64KB each
+    output:
+        - a generator of (char offset, texts, starts, ends) per range, in
+          order, starts and ends being array('l') relative to the offset,
+          raise ValueError if the path is not a regular file
+    '''
+    shared = None
+    if isinstance(text_or_path, os.PathLike):
+        path = os.fspath(text_or_path)
+        with open(path, 'rb') as input_f:
+            file_stat = os.fstat(input_f.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                raise ValueError(
+                    '{} is not a regular file, it can not be memory '
+                    'mapped'.format(path))
+            if file_stat.st_size == 0:
+                return
+            with mmap.mmap(input_f.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mapped:
+                size = len(mapped)
+                if chunk_size is None:
+                    chunk_size = max(size // (workers * 4), 1 << 16)
+                ranges = list(iter_byte_ranges(mapped, chunk_size))
+        tasks = [(('file', path), start, end) for start, end in ranges]
+    else:
+        data = text_or_path.encode('utf-8')
+        if not data:
+            return
+        if chunk_size is None:
+            chunk_size = max(len(data) // (workers * 4), 1 << 16)
+        ranges = list(iter_byte_ranges(data, chunk_size))
+        try:
+            from multiprocessing.shared_memory import SharedMemory
+        except ImportError:
+            tasks = [(('bytes', data[start:end]), 0, end - start)
+                     for start, end in ranges]
+        else:
+            shared = SharedMemory(create=True, size=len(data))
+            shared.buf[:len(data)] = data
+            tasks = [(('shared_memory', shared.name), start, end)
+                     for start, end in ranges]
+        del data
+
+    try:
+        with create_pool(tokenizer, workers) as pool:
+            offset = 0
+            for length, texts, starts, ends in pool.starmap(
+                    _tokenize_range, tasks, 1):
+                yield offset, texts, starts, ends
+                offset += length
+    finally:
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+
+
+def create_pool(tokenizer, workers):
+    '''
+    create a process pool, each worker holds its own copy of tokenizer
+
+    params:
+        - tokenizer: Tokenizer object, sent once to every worker
+        - workers: number of worker processes
+    '''
+    # multiprocessing is slow to import, only load it when a pool is used
+    import multiprocessing
+    return multiprocessing.Pool(workers,
+                                initializer=_init_worker,
+                                initargs=(tokenizer,))
+
+
+def map_tokenize(pool, texts, chunksize=DEFAULT_CHUNKSIZE, with_pos=False):
+    '''
+    tokenize a list of texts in a pool from create_pool, keeping the order
+
+    params:
+        - pool: process pool created by create_pool
+        - texts: list of strings
+        - chunksize: number of texts sent to a worker at a time
+        - with_pos: output (text, start, end) tuples instead of strings
+    output:
+        - a list of token lists, one per input text
+    '''
+    func = _tokenize_with_pos if with_pos else _tokenize
+    return pool.map(func, texts, chunksize)
+
+
+def imap_tokenize(tokenizer, texts, workers,
+                  chunksize=DEFAULT_CHUNKSIZE, with_pos=False):
+    '''
+    lazily tokenize texts in a process pool, keeping the input order
+
+    params:
+        - tokenizer: Tokenizer object
+        - texts: iterable of strings, consumed block by block so a large
+          input is never fully held in memory
+        - workers: number of worker processes
+        - chunksize: number of texts sent to a worker at a time
+        - with_pos: output (text, start, end) tuples instead of strings
+    output:
+        - a generator of token lists, one per input text
+    '''
+    func = _tokenize_with_pos if with_pos else _tokenize
+    block_size = workers * chunksize * 4
+    texts = iter(texts)
+    with create_pool(tokenizer, workers) as pool:
+        while True:
+            block = list(islice(texts, block_size))
+            if not block:
+                break
+            for tokens in pool.imap(func, block, chunksize):
+                yield tokens
@@ -7,6 +7,24 @@ def _captured_pattern(pattern):
     return r'(' + pattern + r')'
 
 
+class _LazyRegexp:
+    '''
+    class attribute compiling its pattern on first access, then replacing
+    itself by the compiled regexp, so importing the module stays cheap
+    '''
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        regexp = re.compile(self.pattern)
+        setattr(owner, self.name, regexp)
+        return regexp
+
+
 class Patterns:
     '''
     Contains a set of special chars could be used for tokenization'
@@ -20,11 +38,18 @@ class Patterns:
          ".", ";", ":", ",", "?", "!", ","]
     )
 
+    # sentence boundary, a standalone end token, then the closing chars
+    # glued to it, '“' and '«' open a quote in English and French
+    SENTENCE_END = frozenset([".", "?", "!"])
+    SENTENCE_CLOSE = frozenset(
+        [")", "]", "'", "»", "”", "’", '"']
+    )
+
     # digit, unit
     ###################################
 
     # Derived unit : (base SI unit)
-    si_units = [
+    si_units = frozenset([
         "m²", "fm", "cm²", "m³", "cm³", "l", "ltr", "dl", "cl", "ml",
         "°C", "°F", "K", "g", "gr", "kg", "t", "mg", "μg", "m", "km",
         "mm", "μm", "cm", "sm", "s", "ms", "μs", "Nm", "klst", "min",
@@ -32,17 +57,17 @@ class Patterns:
         "kWh", "MWh", "kWst", "MWst", "kcal", "cal", "N", "kN", "V", "v",
         "mV", "kV", "A", "mA", "Hz", "kHz", "MHz", "GHz", "Pa", "hPa",
         "°", "°c", "°f"
-    ]
+    ])
 
     digits_pn = r'(?:\b|^)[-+±~]?(?:\d[-.,0-9\/#]*\d|'\
                 r'\d+(?:st|nd|rd|th|[dD])?)'\
                 r'[%]?(?:\b|$)'
     digits_captured_pn = _captured_pattern(digits_pn)
 
-    DIGIT_RE = re.compile(r'\d')
-    DIGITS_RE = re.compile(digits_pn)
-    DIGITS_CAPTURED_RE = re.compile(digits_captured_pn)
-    YEAR_RE = re.compile(r'(?:\b|^)(?:19|20)\d\d(?:\b|$)')
+    DIGIT_RE = _LazyRegexp(r'\d')
+    DIGITS_RE = _LazyRegexp(digits_pn)
+    DIGITS_CAPTURED_RE = _LazyRegexp(digits_captured_pn)
+    YEAR_RE = _LazyRegexp(r'(?:\b|^)(?:19|20)\d\d(?:\b|$)')
 
     # url, email
     ##################################
@@ -59,12 +84,12 @@ class Patterns:
     all_web_pn = "|".join([url_strict_pn, url_pn, email_pn, domain_pn])
     all_web_captured_pn = _captured_pattern(all_web_pn)
 
-    URL_RE = re.compile("|".join([url_pn, url_strict_pn]))
-    EMAIL_RE = re.compile(email_pn)
-    DOMAIN_RE = re.compile(domain_pn)
+    URL_RE = _LazyRegexp("|".join([url_pn, url_strict_pn]))
+    EMAIL_RE = _LazyRegexp(email_pn)
+    DOMAIN_RE = _LazyRegexp(domain_pn)
 
-    ALL_WEB_RE = re.compile(all_web_pn)
-    ALL_WEB_CAPTURED_RE = re.compile(all_web_captured_pn)
+    ALL_WEB_RE = _LazyRegexp(all_web_pn)
+    ALL_WEB_CAPTURED_RE = _LazyRegexp(all_web_captured_pn)
 
     # word bourdary
     ##################################
@@ -74,15 +99,15 @@ class Patterns:
                  r'[\u25A0-\u25FF]|' \
                  r'\.{2,}'
     word_bf_captured_pn = _captured_pattern(word_bf_pn)
-    WORD_BF_CAPTURED_RE = re.compile(word_bf_captured_pn)
+    WORD_BF_CAPTURED_RE = _LazyRegexp(word_bf_captured_pn)
 
     # looks the same, but actually different hyphens
     hyphen_pn = r'[\-\–\—]'
-    HYPHEN_RE = re.compile(hyphen_pn)
-    HYPHEN_CAPTURED_RE = re.compile(_captured_pattern(hyphen_pn))
+    HYPHEN_RE = _LazyRegexp(hyphen_pn)
+    HYPHEN_CAPTURED_RE = _LazyRegexp(_captured_pattern(hyphen_pn))
 
-    COMMON_HYPHEN_START = ['e', 'i', 're', 'ex', 'self',
-                           'fore', 'all', 'low', 'high']
+    COMMON_HYPHEN_START = frozenset(['e', 'i', 're', 'ex', 'self',
+                                     'fore', 'all', 'low', 'high'])
 
     # abbrev
     ##################################
@@ -92,18 +117,42 @@ class Patterns:
 
     repeat_abbrev_pn = r'(\w\.){2,}'
     known_month_pn = r"(?:" + r"|".join(months) + r")\."
-    ABBREV_RE = re.compile(repeat_abbrev_pn + r'|' + known_month_pn)
+    MONTHS = frozenset(months)
+    ABBREV_RE = _LazyRegexp(repeat_abbrev_pn + r'|' + known_month_pn)
 
-    PUNCT_SEQ_RE = re.compile(r'[-!\'#%&`()\[\]*+,.\\/:;<=>?@^$_{|}~]+')
-    PARA_SEP_RE = re.compile(r'(\W|\+\-)\1{4,}')
+    PUNCT_SEQ_RE = _LazyRegexp(r'[-!\'#%&`()\[\]*+,.\\/:;<=>?@^$_{|}~]+')
+    PARA_SEP_RE = _LazyRegexp(r'(\W|\+\-)\1{4,}')
+
+    # cheap pre-checks, a phrase failing one can not fully match the regexp
+    ##################################
+    DIGITS_SIGNS = frozenset('-+±~')
+
+    @staticmethod
+    def may_be_digits(phrase):
+        '''DIGITS_RE can only match from a digit, or a sign and a digit'''
+        return phrase[0].isdecimal() or \
+            (phrase[0] in Patterns.DIGITS_SIGNS and phrase[1:2].isdecimal())
+
+    @staticmethod
+    def may_be_para_sep(phrase):
+        '''PARA_SEP_RE needs 5 repeats of a non word char'''
+        return len(phrase) > 4 and not phrase[0].isalnum() and \
+            phrase[0] != '_'
+
+    @staticmethod
+    def may_be_web(phrase):
+        '''every ALL_WEB_RE alternative needs a '.' or a '://' '''
+        return '.' in phrase or '://' in phrase
 
     @staticmethod
     def abbreviation(phrase):
         is_abbrev = False
         if phrase[-1] == '.':
-            if phrase[0].isupper() and phrase[:-1].isalpha() and \
-                    len(phrase[:-1]) < 4:
+            head = phrase[:-1]
+            if phrase[0].isupper() and head.isalpha() and len(head) < 4:
+                is_abbrev = True
+            elif head in Patterns.MONTHS:
                 is_abbrev = True
-            elif Patterns.ABBREV_RE.fullmatch(phrase):
+            elif '.' in head and Patterns.ABBREV_RE.fullmatch(phrase):
                 is_abbrev = True
         return is_abbrev
@@ -0,0 +1,154 @@
+'''Readers to split large text input into whitespace bounded chunks'''
+import mmap
+import os
+import re
+import stat
+from ._compat import isascii
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# greedy match up to and including the last whitespace char
+_HEAD_RE = re.compile(r'.*\s', re.DOTALL)
+# same on utf-8 bytes, ascii whitespace is never part of a multibyte char
+_BYTES_HEAD_RE = re.compile(rb'.*\s', re.DOTALL)
+_BYTES_SPACE_RE = re.compile(rb'\s')
+
+
+def last_boundary(text):
+    '''position right after the last whitespace char of text, 0 if none'''
+    match = _HEAD_RE.match(text)
+    return match.end() if match is not None else 0
+
+
+def is_regular_file(path):
+    '''
+    True if path is a regular file, which can be memory mapped, False for a
+    pipe, a FIFO or a device, whose size is reported as 0
+    '''
+    return stat.S_ISREG(os.stat(path).st_mode)
+
+
+def iter_chunks(input_f, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    read a text file object in chunks, split on whitespace boundaries
+
+    params:
+        - input_f: file object opened in text mode
+        - chunk_size: number of chars to read at a time
+    output:
+        - a generator of (offset, chunk) pairs, offset being the char
+          position of the chunk in the whole text
+    '''
+    offset = 0
+    pending = []
+    while True:
+        data = input_f.read(chunk_size)
+        if not data:
+            break
+        boundary = last_boundary(data)
+        if boundary == 0:
+            # no whitespace yet, keep reading the unbroken phrase
+            pending.append(data)
+            continue
+        pending.append(data[:boundary])
+        chunk = ''.join(pending)
+        yield offset, chunk
+        offset += len(chunk)
+        pending = [data[boundary:]]
+
+    chunk = ''.join(pending)
+    if chunk:
+        yield offset, chunk
+
+
+def iter_byte_ranges(data, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    split utf-8 bytes into ranges of about chunk_size bytes, each range but
+    the last one ending right after an ascii whitespace byte, so it never
+    cuts a multibyte char or a phrase without whitespace
+
+    params:
+        - data: bytes like object, e.g. a mmap
+        - chunk_size: number of bytes per range, ranges are extended up to
+          the next whitespace byte when they have none
+    output:
+        - a generator of (start, end) byte positions
+    '''
+    size = len(data)
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            match = _BYTES_HEAD_RE.match(data, start, end)
+            if match is not None:
+                end = match.end()
+            else:
+                # unbroken phrase, extend to the next space
+                match = _BYTES_SPACE_RE.search(data, end)
+                end = match.end() if match is not None else size
+        yield start, end
+        start = end
+
+
+def iter_file_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    memory map a utf-8 file and decode it in chunks split on whitespace
+    boundaries, the file is scanned in place without reading it first.
+    Chunks end on an ascii whitespace byte, so they never cut a multibyte
+    char and each chunk decodes on its own. Unlike a file opened in text
+    mode, line ends are kept as they are, so positions match the file.
+
+    params:
+        - path: utf-8 text file
+        - chunk_size: number of bytes to decode at a time
+    output:
+        - a generator of (offset, byte_offset, chunk), offset being the char
+          position and byte_offset the byte position of the chunk, raise
+          ValueError if path is not a regular file, read a pipe with
+          iter_chunks instead
+    '''
+    with open(path, 'rb') as input_f:
+        file_stat = os.fstat(input_f.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise ValueError(
+                '{} is not a regular file, it can not be memory '
+                'mapped'.format(path))
+        if file_stat.st_size == 0:
+            return
+        with mmap.mmap(input_f.fileno(), 0, access=mmap.ACCESS_READ) \
+                as mapped:
+            view = memoryview(mapped)
+            try:
+                offset = 0
+                for start, end in iter_byte_ranges(mapped, chunk_size):
+                    with view[start:end] as chunk_view:
+                        chunk = str(chunk_view, 'utf-8')
+                    yield offset, start, chunk
+                    offset += len(chunk)
+            finally:
+                view.release()
+
+
+class ByteOffsets:
+    '''
+    map increasing char positions in a text to utf-8 byte positions,
+    encoding only the text between two consecutive positions
+
+    params:
+        - text: string
+        - byte_offset: byte position of the text
+    '''
+    def __init__(self, text, byte_offset=0):
+        self.text = text
+        self.byte_offset = byte_offset
+        self.is_ascii = isascii(text)
+        self._char_pos = 0
+        self._byte_pos = byte_offset
+
+    def __call__(self, position):
+        if self.is_ascii:
+            return self.byte_offset + position
+        self._byte_pos += len(
+            self.text[self._char_pos:position].encode('utf-8'))
+        self._char_pos = position
+        return self._byte_pos
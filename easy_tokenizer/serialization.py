@@ -0,0 +1,215 @@
+'''
+Compact binary files of tokens with positions
+
+    - header: magic b'ETOK', format version and reserved flags as 2 byte
+      ints, then number of tokens, number of strings and byte position of
+      the string table as 8 byte ints, all little endian
+    - tokens: per token three varints, the id of its text in the string
+      table, the zigzag encoded distance from the end of the previous
+      token to its start, and its length
+    - string table: per distinct token text, in id order, the varint byte
+      length and the utf-8 bytes
+
+Varints are little endian base 128, 7 bits per byte, the high bit set on
+every byte but the last.
+'''
+import mmap
+import os
+import struct
+from .token_with_pos import TokenWithPos
+
+MAGIC = b'ETOK'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHHQQQ')
+
+
+def _varint(value):
+    '''varint bytes of a non negative int'''
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append(value & 0x7f | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return encoded
+
+
+def _zigzag(value):
+    '''map ints to non negative ints, 0, -1, 1, -2 ... to 0, 1, 2, 3 ...'''
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class TokenWriter:
+    '''
+    TokenWriter: write tokens to a binary token file as they come, the
+    string table and the header are written on close. Used as a context
+    manager, nothing is written on an exception, the header stays zeroed
+    so readers reject the truncated file.
+
+    Parameters:
+        - output_f: empty seekable file object opened in binary mode
+    '''
+    def __init__(self, output_f):
+        self.output_f = output_f
+        self.count = 0
+        self._string_ids = {}
+        self._end = 0
+        output_f.write(bytes(_HEADER.size))
+
+    def write(self, token):
+        '''
+        append one token
+
+        params:
+            - token: Token object, or (text, start, end) tuple
+        '''
+        if isinstance(token, TokenWithPos):
+            text, start, end = token.text, token.start, token.end
+        else:
+            text, start, end = token
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._string_ids)
+        self.output_f.write(_varint(string_id) +
+                            _varint(_zigzag(start - self._end)) +
+                            _varint(end - start))
+        self._end = end
+        self.count += 1
+
+    def write_all(self, tokens):
+        '''append all tokens of an iterable'''
+        for token in tokens:
+            self.write(token)
+
+    def close(self):
+        '''write the string table and the header'''
+        table_offset = self.output_f.tell()
+        for text in self._string_ids:
+            encoded = text.encode('utf-8')
+            self.output_f.write(_varint(len(encoded)))
+            self.output_f.write(encoded)
+        end = self.output_f.tell()
+        self.output_f.seek(0)
+        self.output_f.write(_HEADER.pack(MAGIC, VERSION, 0, self.count,
+                                         len(self._string_ids),
+                                         table_offset))
+        self.output_f.seek(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+
+class TokenReader:
+    '''
+    TokenReader: memory map a binary token file, the string table is read
+    on open, the tokens are decoded lazily while iterating
+
+    Parameters:
+        - path: binary token file
+    '''
+    def __init__(self, path):
+        with open(path, 'rb') as input_f:
+            if os.fstat(input_f.fileno()).st_size < _HEADER.size:
+                raise ValueError('{} is not a token file'.format(path))
+            self._mmap = mmap.mmap(input_f.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        magic, version, _, count, string_count, table_offset = \
+            _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError('{} is not a token file'.format(path))
+        self.count = count
+        self._table_offset = table_offset
+        self.strings = []
+        position = table_offset
+        for _ in range(string_count):
+            length, position = self._read_varint(position)
+            self.strings.append(
+                self._mmap[position:position + length].decode('utf-8'))
+            position += length
+
+    def _read_varint(self, position):
+        '''(value, next position) of the varint at position'''
+        data = self._mmap
+        value = 0
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value, position
+            shift += 7
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        '''iterate over the Token objects'''
+        return self._iter_tokens(with_text=True)
+
+    def spans(self):
+        '''iterate over the (start, end) spans, without the token texts'''
+        return self._iter_tokens(with_text=False)
+
+    def _iter_tokens(self, with_text):
+        read_varint = self._read_varint
+        strings = self.strings
+        position = _HEADER.size
+        end = 0
+        for _ in range(self.count):
+            string_id, position = read_varint(position)
+            distance, position = read_varint(position)
+            length, position = read_varint(position)
+            start = end + _unzigzag(distance)
+            end = start + length
+            if with_text:
+                yield TokenWithPos(strings[string_id], start, end)
+            else:
+                yield start, end
+
+    def close(self):
+        '''release the mapped file'''
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_token_file(path, tokens):
+    '''
+    write tokens to a binary token file
+
+    params:
+        - path: output file
+        - tokens: iterable of Token objects or (text, start, end) tuples
+    output:
+        - number of tokens written
+    '''
+    with open(path, 'wb') as output_f, TokenWriter(output_f) as writer:
+        writer.write_all(tokens)
+    return writer.count
+
+
+def read_token_file(path):
+    '''
+    open a binary token file
+
+    params:
+        - path: binary token file
+    output:
+        - TokenReader, iterate over it for the Token objects, close it to
+          release the file
+    '''
+    return TokenReader(path)
@@ -0,0 +1,237 @@
+'''
+Tokenizer server: keep a tokenizer and its worker processes running and
+answer tokenize requests over stdin/stdout or a local Unix socket
+
+Every message is a frame: the length of the payload as a 4 byte big
+endian unsigned int, then the payload, utf-8 encoded JSON.
+
+    - request: {"texts": [string, ...], "with_pos": false}
+    - response: {"tokens": [[token, ...], ...]}, with "with_pos" each
+      token is [token, start, end]; {"error": message} for a bad request
+'''
+import errno
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+from argparse import ArgumentParser
+from . import get_logger
+from .tokenizer import Tokenizer
+from .parallel import create_pool, map_tokenize
+
+_HEADER = struct.Struct('>I')
+
+
+def read_frame(input_f):
+    '''
+    read one frame from a binary file object
+
+    output:
+        - the payload bytes, None at the end of the input
+    '''
+    header = input_f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    size, = _HEADER.unpack(header)
+    payload = input_f.read(size)
+    if len(payload) < size:
+        return None
+    return payload
+
+
+def write_frame(output_f, payload):
+    '''write the payload bytes as one frame to a binary file object'''
+    output_f.write(_HEADER.pack(len(payload)))
+    output_f.write(payload)
+    output_f.flush()
+
+
+class TokenizerService:
+    '''
+    TokenizerService: answer decoded requests with a tokenizer, in a pool
+    of worker processes started once when workers is more than 1
+
+    Parameters:
+        - tokenizer: Tokenizer object
+        - workers: number of worker processes, 1 to tokenize in this
+          process
+    '''
+    def __init__(self, tokenizer, workers=1):
+        self.tokenizer = tokenizer
+        self.workers = workers
+        self.pool = create_pool(tokenizer, workers) if workers > 1 else None
+
+    def close(self):
+        '''stop the worker processes'''
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def tokenize(self, texts, with_pos=False):
+        '''
+        tokenize a batch of texts
+
+        params:
+            - texts: list of strings
+            - with_pos: output [token, start, end] lists instead of strings
+        output:
+            - a list of token lists, one per text
+        '''
+        if self.pool is not None:
+            chunksize = max(1, len(texts) // (self.workers * 4))
+            return map_tokenize(self.pool, texts, chunksize, with_pos)
+        if with_pos:
+            return [[(token.text, token.start, token.end)
+                     for token in self.tokenizer.tokenize_with_pos_info(text)]
+                    for text in texts]
+        return [self.tokenizer.tokenize(text) for text in texts]
+
+    def handle(self, payload):
+        '''
+        answer one request
+
+        params:
+            - payload: bytes of a request frame
+        output:
+            - bytes of the response frame
+        '''
+        try:
+            request = json.loads(payload.decode('utf-8'))
+            texts = request['texts']
+            if not isinstance(texts, list) or \
+                    not all(isinstance(text, str) for text in texts):
+                raise ValueError('"texts" should be a list of strings')
+            response = {'tokens': self.tokenize(
+                texts, bool(request.get('with_pos')))}
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            response = {'error': '{}: {}'.format(type(error).__name__, error)}
+        return json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+    def serve_stream(self, input_f, output_f):
+        '''
+        answer the request frames read from input_f until its end
+
+        params:
+            - input_f: binary file object with request frames
+            - output_f: binary file object to write the response frames to
+        '''
+        while True:
+            payload = read_frame(input_f)
+            if payload is None:
+                break
+            write_frame(output_f, self.handle(payload))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.service.serve_stream(self.rfile, self.wfile)
+
+
+class TokenizerServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+    '''
+    TokenizerServer: serve a TokenizerService on a Unix socket, one thread
+    per connection, the connections share the service and its workers
+
+    Parameters:
+        - path: path of the Unix socket, a stale socket left there is
+          replaced, a socket a server listens on raises OSError with
+          errno.EADDRINUSE, any other file raises FileExistsError
+        - service: TokenizerService object
+    '''
+    daemon_threads = True
+
+    def __init__(self, path, service):
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(
+                    '{} exists and is not a socket'.format(path))
+            with socket.socket(socket.AF_UNIX) as probe:
+                try:
+                    probe.connect(path)
+                except ConnectionRefusedError:
+                    # nobody listens, left by a server that did not stop
+                    os.unlink(path)
+                else:
+                    raise OSError(
+                        errno.EADDRINUSE,
+                        'address in use, a server listens on {}'.format(
+                            path))
+        self.service = service
+        self._socket_inode = None
+        super().__init__(path, _RequestHandler)
+        self._socket_inode = os.lstat(path).st_ino
+
+    def server_close(self):
+        super().server_close()
+        # only remove the socket created by this server
+        try:
+            path_stat = os.lstat(self.server_address)
+        except FileNotFoundError:
+            return
+        if stat.S_ISSOCK(path_stat.st_mode) and \
+                path_stat.st_ino == self._socket_inode:
+            os.unlink(self.server_address)
+
+
+def get_args(argv=None):
+    '''get arguments of the serve command'''
+    parser = ArgumentParser(description='serve tokenize requests',
+                            prog='easy-tokenizer serve')
+    parser.add_argument('--socket',
+                        help='listen on this Unix socket, '
+                             'default as STDIN/STDOUT',
+                        type=str)
+    parser.add_argument('-w',
+                        '--workers',
+                        help='number of worker processes, default as 1',
+                        default=1,
+                        type=int)
+    parser.add_argument('--max-phrase-length',
+                        help='split phrases without whitespace longer than '
+                             'N chars in linear time',
+                        type=int)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    '''
+    tokenizer server
+
+    params:
+
+    - socket: Unix socket to listen on, default as STDIN/STDOUT
+
+    - workers: number of worker processes kept running
+
+    - max_phrase_length: see the tokenizer command
+    '''
+    args = get_args(argv)
+    tokenizer = Tokenizer(max_phrase_length=args.max_phrase_length)
+    with TokenizerService(tokenizer, args.workers) as service:
+        if args.socket:
+            try:
+                server = TokenizerServer(args.socket, service)
+            except OSError as error:
+                sys.exit('easy-tokenizer serve: {}'.format(error))
+            get_logger().info('serve on {} with {} workers'.format(
+                args.socket, args.workers))
+            with server:
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+        else:
+            get_logger().info('serve on STDIN/STDOUT with {} workers'.format(
+                args.workers))
+            service.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
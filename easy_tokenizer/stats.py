@@ -0,0 +1,121 @@
+'''Class to collect per stage counters of a Tokenizer'''
+from collections import Counter
+from time import perf_counter
+
+
+class TokenizerStats:
+    '''
+    TokenizerStats: call counts and time of tokenizer stages, and types
+    of the tokens produced. The stages below 'phrase' only run for the
+    phrases missing from the phrase cache.
+        attributes:
+        - calls: number of calls per stage
+        - seconds: cumulative time per stage, nested stages included
+        - self_seconds: cumulative time per stage, nested stages excluded
+        - token_types: number of tokens produced per token type, cached
+          phrases included, 'other' for tokens not matching any type
+    '''
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = Counter()
+        self.self_seconds = Counter()
+        self.token_types = Counter()
+        # time spent in nested stages, one entry per running stage
+        self._nested_seconds = []
+
+    def reset(self):
+        '''clear all counters'''
+        self.calls.clear()
+        self.seconds.clear()
+        self.self_seconds.clear()
+        self.token_types.clear()
+
+    def _stop(self, stage, elapsed):
+        nested = self._nested_seconds.pop()
+        self.seconds[stage] += elapsed
+        self.self_seconds[stage] += elapsed - nested
+        if self._nested_seconds:
+            self._nested_seconds[-1] += elapsed
+
+    def time_function(self, stage, func):
+        '''
+        wrap func to record its calls and time under stage
+
+        params:
+            - stage: name of the stage
+            - func: function to wrap
+        '''
+        def timed(*args):
+            self.calls[stage] += 1
+            self._nested_seconds.append(0.0)
+            start = perf_counter()
+            try:
+                result = func(*args)
+            finally:
+                self._stop(stage, perf_counter() - start)
+            return result
+        return timed
+
+    def time_generator(self, stage, func):
+        '''
+        wrap the generator function func to record its calls and the time
+        spent producing its items under stage
+        '''
+        def timed(*args):
+            self.calls[stage] += 1
+            generator = func(*args)
+            while True:
+                self._nested_seconds.append(0.0)
+                start = perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    self._stop(stage, perf_counter() - start)
+                yield item
+        return timed
+
+    def count_token_types(self, func):
+        '''
+        wrap the generator function func, yielding (start, splits) pairs
+        of (text, start, end, TokenType) tuples, to count the token types
+        '''
+        def counted(*args):
+            for start, splits in func(*args):
+                for split in splits:
+                    self.token_types[split[3].name.lower()] += 1
+                yield start, splits
+        return counted
+
+    def as_dict(self):
+        '''all counters as a dict of plain dicts'''
+        return {
+            'calls': dict(self.calls),
+            'seconds': dict(self.seconds),
+            'self_seconds': dict(self.self_seconds),
+            'token_types': dict(self.token_types),
+        }
+
+    def report(self, cache_info=None):
+        '''
+        human readable report of the counters
+
+        params:
+            - cache_info: optional phrase cache info of the tokenizer
+        '''
+        lines = ['{:<24} {:>10} {:>10} {:>10}'.format(
+            'stage', 'calls', 'seconds', 'self')]
+        for stage, calls in self.calls.most_common():
+            lines.append('{:<24} {:>10} {:>10.4f} {:>10.4f}'.format(
+                stage, calls, self.seconds[stage], self.self_seconds[stage]))
+        lines.append('(stages under phrase only run on phrase cache misses)')
+        lines.append('')
+        lines.append('{:<24} {:>10}'.format('token type', 'tokens'))
+        for token_type, count in self.token_types.most_common():
+            lines.append('{:<24} {:>10}'.format(token_type, count))
+        if cache_info is not None:
+            lines.append('')
+            lines.append('phrase cache: {} hits, {} misses, {} entries'.format(
+                cache_info.hits, cache_info.misses, cache_info.currsize))
+        return '\n'.join(lines)
@@ -0,0 +1,56 @@
+'''Class for reusable token span buffers'''
+from array import array
+
+
+class TokenBuffer:
+    '''
+    TokenBuffer: token spans written by Tokenizer.tokenize_into, the arrays
+    are reused from one text to the next and only grow, in place
+        attributes:
+        - starts: array('l') of token start positions
+        - ends: array('l') of token end positions
+        - size: number of tokens of the last text, the arrays can be longer
+
+    Parameters:
+        - capacity: number of tokens to allocate room for
+    '''
+    __slots__ = ('starts', 'ends', 'size')
+
+    def __init__(self, capacity=1024):
+        self.starts = array('l')
+        self.ends = array('l')
+        self.size = 0
+        self.reserve(capacity)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        '''number of tokens the buffer holds without growing'''
+        return len(self.starts)
+
+    def reserve(self, capacity):
+        '''
+        make room for at least capacity tokens, at least doubling the size
+        so that growing costs amortized constant time per token
+        '''
+        if capacity <= len(self.starts):
+            return
+        extra = max(capacity, 2 * len(self.starts)) - len(self.starts)
+        padding = bytes(extra * self.starts.itemsize)
+        self.starts.frombytes(padding)
+        self.ends.frombytes(padding)
+
+    def spans(self):
+        '''iterator of the (start, end) spans of the last text'''
+        return zip(self.starts[:self.size], self.ends[:self.size])
+
+    def tokens(self, text):
+        '''
+        token strings of the last text
+
+        params:
+            - text: the text given to tokenize_into
+        '''
+        return [text[start:end] for start, end in self.spans()]
@@ -1,4 +1,5 @@
 '''Class for tokens with position information'''
+from enum import IntEnum
 
 
 class TokenWithPos:
@@ -9,6 +10,8 @@ class TokenWithPos:
         - start: start position
         - end: end position
     '''
+    __slots__ = ('text', 'start', 'end')
+
     def __init__(self, text, start, end):
         self.text = text
         self.start = start
@@ -16,3 +19,76 @@ class TokenWithPos:
 
     def __repr__(self):
         return "{} [{}:{}]".format(self.text, self.start, self.end)
+
+
+class TokenWithBytePos(TokenWithPos):
+    '''
+    TokenWithBytePos: token with char and byte positions in a file
+        attributes:
+        - text: text in the normalized form
+        - start: start char position
+        - end: end char position
+        - byte_start: start byte position in the utf-8 encoded file
+        - byte_end: end byte position in the utf-8 encoded file
+    '''
+    __slots__ = ('byte_start', 'byte_end')
+
+    def __init__(self, text, start, end, byte_start, byte_end):
+        super().__init__(text, start, end)
+        self.byte_start = byte_start
+        self.byte_end = byte_end
+
+    def __repr__(self):
+        return "{} [{}:{}] [{}:{}]".format(self.text, self.start, self.end,
+                                           self.byte_start, self.byte_end)
+
+
+class TokenType(IntEnum):
+    '''
+    TokenType: compact codes of the token types found by the tokenizer,
+    OTHER for tokens not matching any type
+    '''
+    OTHER = 0
+    SINGLE_CHAR = 1
+    WORD = 2
+    UNIT = 3
+    DIGIT = 4
+    PUNCTUATION_SEQ = 5
+    ABBREVIATION = 6
+    URL_EMAIL = 7
+
+
+# codes of the type names given by Tokenizer._phrase_full_match
+TOKEN_TYPE_CODES = {
+    None: TokenType.OTHER,
+    'single_char': TokenType.SINGLE_CHAR,
+    'word': TokenType.WORD,
+    'unit': TokenType.UNIT,
+    'digit': TokenType.DIGIT,
+    'punctuation_seq': TokenType.PUNCTUATION_SEQ,
+    'abbreviation': TokenType.ABBREVIATION,
+    'url/email': TokenType.URL_EMAIL,
+}
+
+
+class TokenWithType(TokenWithPos):
+    '''
+    TokenWithType: token with positions and type
+        attributes:
+        - text: text in the normalized form
+        - start: start position
+        - end: end position
+        - token_type: TokenType code, None while not classified yet
+    '''
+    __slots__ = ('token_type',)
+
+    def __init__(self, text, start, end, token_type=None):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.token_type = token_type
+
+    def __repr__(self):
+        return "{} [{}:{}] {}".format(
+            self.text, self.start, self.end,
+            'None' if self.token_type is None else self.token_type.name)
@@ -1,8 +1,31 @@
 '''Tokenizer Class'''
 # -*- encoding: utf-8 -*-
+import os
 import re
-from .token_with_pos import TokenWithPos
-from .patterns import Patterns
+from array import array
+from functools import lru_cache
+from itertools import islice
+from .token_with_pos import (TokenWithPos, TokenWithBytePos, TokenWithType,
+                             TokenType, TOKEN_TYPE_CODES)
+from .tokenizer_profile import TokenizerProfile, get_profile
+from .stats import TokenizerStats
+from .normalizer import normalize_chars_with_offsets
+from ._compat import isascii, get_running_loop
+from .reader import (last_boundary, iter_file_chunks, ByteOffsets,
+                     DEFAULT_CHUNK_SIZE)
+from . import parallel
+
+
+def _bisect_start(tokens, position, low=0):
+    '''index of the first token starting at or after position'''
+    high = len(tokens)
+    while low < high:
+        middle = (low + high) // 2
+        if tokens[middle].start < position:
+            low = middle + 1
+        else:
+            high = middle
+    return low
 
 
 class Tokenizer():
@@ -11,49 +34,234 @@ class Tokenizer():
 
     Parameters:
         - regexp: regexp used to tokenize the string
+        - cache_size: max number of phrases whose splits are kept in the
+          LRU cache, 0 to disable the cache, None for no limit
+        - engine: 'cascade' to split phrases level by level with nested
+          generators, 'stack' for the same cascade run with an explicit
+          stack, skipping the levels that can not split a piece, both give
+          the same tokens
+        - collect_stats: record call counts and time per stage, and the
+          types of the tokens produced, in self.stats, methods are only
+          wrapped when enabled
+        - profile: TokenizerProfile, or the name of a registered one, with
+          the vocabularies and patterns to use, default profile if None
+        - max_phrase_length: phrases without whitespace longer than this,
+          like base64 blobs or minified code, are only split on word
+          boundaries and hyphens in linear time, the url, email and digit
+          regexps can take seconds on them. None to split all phrases the
+          same way. self.guard_hits counts the phrases split this way in
+          this process, every occurrence of a phrase included.
     '''
-    def __init__(self, regexp=None):
+    DEFAULT_CACHE_SIZE = 1 << 16
+    ENGINES = ('cascade', 'stack')
+
+    # (method, stage name, is a generator) instrumented by collect_stats
+    STAGES = (
+        ('_split_phrase', 'phrase', False),
+        ('_top_down_level_1', 'url/email split', True),
+        ('_top_down_level_2', 'digit split', True),
+        ('_top_down_level_3', 'word boundary split', True),
+        ('_top_down_level_4', 'hyphen split', True),
+        ('_stack_cascade', 'stack cascade', False),
+        ('_split_long_phrase', 'long phrase guard', True),
+        ('_adjust_on_punc', 'adjust on punc', True),
+        ('_phrase_full_match', 'phrase full match', False),
+    )
+    # generators of (start, splits) whose token types are counted
+    COUNTED = ('_phrase_splits', '_normalized_phrase_splits')
+
+    def __init__(self, regexp=None, cache_size=DEFAULT_CACHE_SIZE,
+                 engine='cascade', collect_stats=False, profile=None,
+                 max_phrase_length=None):
         if regexp is not None:
             self.regexp = regexp
         else:
             self.regexp = re.compile(r'[^\s]+|\s+')
         self.space_regexp = re.compile(r'\s')
+        if engine not in self.ENGINES:
+            raise ValueError('unknown engine {}, expected one of {}'.format(
+                engine, ', '.join(self.ENGINES)))
+        self.engine = engine
+        if profile is None:
+            profile = get_profile()
+        elif not isinstance(profile, TokenizerProfile):
+            profile = get_profile(profile)
+        self.profile = profile
+        self.cache_size = cache_size
+        self.max_phrase_length = max_phrase_length
+        self.guard_hits = 0
+        self.stats = TokenizerStats() if collect_stats else None
+        self._bind_methods()
+
+    def _bind_methods(self):
+        self._phrase_cache = lru_cache(maxsize=self.cache_size)(
+            self._split_phrase_uncached)
+        self._split_phrase = self._phrase_cache
+        if self.stats is None:
+            return
+        for method, stage, is_generator in self.STAGES:
+            func = getattr(self, method)
+            if is_generator:
+                func = self.stats.time_generator(stage, func)
+            else:
+                func = self.stats.time_function(stage, func)
+            setattr(self, method, func)
+        for method in self.COUNTED:
+            setattr(self, method,
+                    self.stats.count_token_types(getattr(self, method)))
+
+    def __getstate__(self):
+        # the cache and stats wrap bound methods, rebuild them instead
+        state = self.__dict__.copy()
+        del state['_phrase_cache']
+        for method, _, _ in self.STAGES:
+            state.pop(method, None)
+        for method in self.COUNTED:
+            state.pop(method, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_methods()
 
-    def _tokenize(self, text):
+    def cache_info(self):
+        '''
+        statistics of the phrase cache
+
+        output:
+            - named tuple (hits, misses, maxsize, currsize)
+        '''
+        return self._phrase_cache.cache_info()
+
+    def cache_clear(self):
+        '''empty the phrase cache and reset its statistics'''
+        self._phrase_cache.cache_clear()
+
+    def _phrases(self, text):
+        '''yield (start, phrase) for every phrase without whitespace'''
         for match in self.regexp.finditer(text):
             phrase = match.group()
             if self.space_regexp.search(phrase):
                 continue
-            if self._phrase_full_match(phrase) is not None:
-                for adjusted_token in self._adjust_on_punc(
-                        TokenWithPos(phrase, match.start(), match.end())):
-                    yield adjusted_token
+            yield match.start(), phrase
+
+    def _phrase_splits(self, text, offset=0):
+        '''yield (start, splits) for every phrase without whitespace'''
+        max_length = self.max_phrase_length
+        for start, phrase in self._phrases(text):
+            if max_length is not None and len(phrase) > max_length:
+                self.guard_hits += 1
+            yield offset + start, self._split_phrase(phrase)
+
+    def _tokenize(self, text, offset=0):
+        for start, splits in self._phrase_splits(text, offset):
+            for token_text, token_start, token_end, _ in splits:
+                yield TokenWithPos(token_text,
+                                   start + token_start,
+                                   start + token_end)
+
+    def _tokenize_with_type(self, text, offset=0):
+        for start, splits in self._phrase_splits(text, offset):
+            for token_text, token_start, token_end, token_type in splits:
+                yield TokenWithType(token_text,
+                                    start + token_start,
+                                    start + token_end,
+                                    token_type)
+
+    def _normalized_phrase_splits(self, text, offset=0):
+        '''
+        _phrase_splits on the normalized chars of every phrase, the splits
+        hold normalized token texts with positions relative to the phrase
+        in text
+        '''
+        max_length = self.max_phrase_length
+        for start, phrase in self._phrases(text):
+            if isascii(phrase):
+                # nothing to normalize, positions are the same
+                if max_length is not None and len(phrase) > max_length:
+                    self.guard_hits += 1
+                yield offset + start, self._split_phrase(phrase)
+                continue
+            # normalizing can add whitespace, e.g. to a lone diaeresis
+            normalized, offsets = normalize_chars_with_offsets(phrase)
+            splits = []
+            for sub_start, sub_phrase in self._phrases(normalized):
+                if max_length is not None and len(sub_phrase) > max_length:
+                    self.guard_hits += 1
+                for token_text, token_start, token_end, token_type in \
+                        self._split_phrase(sub_phrase):
+                    token_end += sub_start
+                    # up to the next kept char, so dropped combining marks
+                    # after the last char stay in the token
+                    splits.append((token_text,
+                                   offsets[sub_start + token_start],
+                                   max(offsets[token_end - 1] + 1,
+                                       offsets[token_end]),
+                                   token_type))
+            yield offset + start, splits
+
+    def _split_phrase_uncached(self, phrase):
+        '''
+        split a phrase without whitespace into (text, start, end, type)
+        tuples, positions are relative to the phrase, type is a TokenType
+        '''
+        return tuple((token.text, token.start, token.end,
+                      self._token_type(token))
+                     for token in self._tokenize_phrase(phrase))
+
+    def _token_type(self, token):
+        '''type code of token, only classified if not known yet'''
+        if token.token_type is None:
+            token.token_type = TOKEN_TYPE_CODES[
+                self._phrase_full_match(token.text)]
+        return token.token_type
+
+    def _is_long_phrase(self, phrase):
+        return self.max_phrase_length is not None and \
+            len(phrase) > self.max_phrase_length
+
+    def _tokenize_phrase(self, phrase, offset=0):
+        if self._is_long_phrase(phrase):
+            tokens = self._split_long_phrase(phrase, offset)
+        else:
+            matched_type = self._phrase_full_match(phrase)
+            if matched_type is not None:
+                tokens = [TokenWithType(phrase,
+                                        offset,
+                                        offset + len(phrase),
+                                        TOKEN_TYPE_CODES[matched_type])]
+            elif self.engine == 'stack':
+                tokens = self._stack_cascade(phrase, offset)
             else:
-                for token in self._top_down_tokenize(phrase,
-                                                     match.start()):
-                    for adjusted_token in self._adjust_on_punc(token):
-                        yield adjusted_token
+                tokens = self._top_down_tokenize(phrase, offset)
+        for token in tokens:
+            for adjusted_token in self._adjust_on_punc(token):
+                yield adjusted_token
 
     def _adjust_on_punc(self, token):
-        if Patterns.PUNCT_SEQ_RE.fullmatch(token.text) and \
-                Patterns.PARA_SEP_RE.fullmatch(token.text) is None:
+        if not token.text[0].isalnum() and \
+                self.profile.PUNCT_SEQ_RE.fullmatch(token.text) and \
+                self.profile.PARA_SEP_RE.fullmatch(token.text) is None:
             # a string of punc, very likely .. or ...
             for shift, single_char in enumerate(token.text):
                 start_pos = token.start + shift
-                yield TokenWithPos(single_char,
-                                   start_pos,
-                                   start_pos + 1)
+                yield TokenWithType(single_char,
+                                    start_pos,
+                                    start_pos + 1,
+                                    TokenType.SINGLE_CHAR)
 
         elif self._has_end_of_phrase_punc(token.text) and \
-                self._phrase_full_match(token.text) in [None, 'url/email']:
+                self._token_type(token) in (TokenType.OTHER,
+                                            TokenType.URL_EMAIL):
             end_pos = token.end - 1
             for splitted_token in [
-                    TokenWithPos(token.text[:-1],
-                                 token.start,
-                                 end_pos),
-                    TokenWithPos(token.text[-1],
-                                 end_pos,
-                                 token.end)
+                    TokenWithType(token.text[:-1],
+                                  token.start,
+                                  end_pos),
+                    TokenWithType(token.text[-1],
+                                  end_pos,
+                                  token.end,
+                                  TokenType.SINGLE_CHAR)
             ]:
                 yield splitted_token
         else:
@@ -68,15 +276,17 @@ class Tokenizer():
         '''
         level 1: split on url, emails
         '''
-        for sub_phrase in re.split(Patterns.ALL_WEB_CAPTURED_RE, phrase):
+        for sub_phrase in re.split(self.profile.ALL_WEB_CAPTURED_RE, phrase):
             if sub_phrase == '':
                 continue
 
             length_sub_phrase = len(sub_phrase)
-            if self._phrase_full_match(sub_phrase) is not None:
-                yield TokenWithPos(sub_phrase,
-                                   offset,
-                                   offset + length_sub_phrase)
+            matched_type = self._phrase_full_match(sub_phrase)
+            if matched_type is not None:
+                yield TokenWithType(sub_phrase,
+                                    offset,
+                                    offset + length_sub_phrase,
+                                    TOKEN_TYPE_CODES[matched_type])
 
             else:
                 for token in self._top_down_level_2(sub_phrase, offset):
@@ -87,15 +297,17 @@ class Tokenizer():
         '''
         level 2: split on number phrases
         '''
-        for sub_phrase in re.split(Patterns.DIGITS_CAPTURED_RE, phrase):
+        for sub_phrase in re.split(self.profile.DIGITS_CAPTURED_RE, phrase):
             if sub_phrase == '':
                 continue
 
             length_sub_phrase = len(sub_phrase)
-            if self._phrase_full_match(sub_phrase) is not None:
-                yield TokenWithPos(sub_phrase,
-                                   offset,
-                                   offset + length_sub_phrase)
+            matched_type = self._phrase_full_match(sub_phrase)
+            if matched_type is not None:
+                yield TokenWithType(sub_phrase,
+                                    offset,
+                                    offset + length_sub_phrase,
+                                    TOKEN_TYPE_CODES[matched_type])
             else:
                 for token in self._top_down_level_3(sub_phrase, offset):
                     yield token
@@ -105,15 +317,17 @@ class Tokenizer():
         '''
         level 3: split on normal word boundaries
         '''
-        for sub_phrase in re.split(Patterns.WORD_BF_CAPTURED_RE, phrase):
+        for sub_phrase in re.split(self.profile.WORD_BF_CAPTURED_RE, phrase):
             if sub_phrase == '':
                 continue
 
             length_sub_phrase = len(sub_phrase)
-            if self._phrase_full_match(sub_phrase) is not None:
-                yield TokenWithPos(sub_phrase,
-                                   offset,
-                                   offset + length_sub_phrase)
+            matched_type = self._phrase_full_match(sub_phrase)
+            if matched_type is not None:
+                yield TokenWithType(sub_phrase,
+                                    offset,
+                                    offset + length_sub_phrase,
+                                    TOKEN_TYPE_CODES[matched_type])
             else:
                 for token in self._top_down_level_4(sub_phrase, offset):
                     yield token
@@ -127,15 +341,15 @@ class Tokenizer():
         splitted = False
         parts = []
         # - split on hyphen #
-        if Patterns.HYPHEN_RE.search(phrase):
+        if self.profile.HYPHEN_RE.search(phrase):
             splitted = True
             parts = [
                 part
-                for part in Patterns.HYPHEN_CAPTURED_RE.split(phrase)
+                for part in self.profile.HYPHEN_CAPTURED_RE.split(phrase)
                 if part != ''
             ]
             if len(parts) == 3:
-                if parts[0].lower() in Patterns.COMMON_HYPHEN_START:
+                if parts[0].lower() in self.profile.COMMON_HYPHEN_START:
                     splitted = False
                 elif len(parts[0]) < 4 and len(parts[2]) < 4 \
                         and len(parts[0]) + len(parts[2]) < 6:
@@ -145,17 +359,91 @@ class Tokenizer():
         if splitted:
             for part in parts:
                 new_offset = offset + len(part)
-                yield TokenWithPos(part, offset, new_offset)
+                yield TokenWithType(part, offset, new_offset)
                 offset = new_offset
         else:
             # pick up what ever left as a token #
-            yield TokenWithPos(phrase, offset, offset + len(phrase))
+            yield TokenWithType(phrase, offset, offset + len(phrase))
+
+    def _stack_cascade(self, phrase, offset=0):
+        '''
+        the level cascade of _top_down_tokenize, same tokens, run with an
+        explicit stack instead of nested generators: each piece is still
+        split by the regexp of its level, but the url and digit levels are
+        skipped when the piece has no '.', '://' or digit, and only the
+        pieces actually split off are classified. The level patterns can
+        not be merged into one alternation, as their anchors and \\b
+        depend on the piece left by the previous level.
+        '''
+        tokens = []
+        # (piece, start, level, type), level 0 is a finished token
+        stack = [(phrase, offset, 1, None)]
+        while stack:
+            piece, start, level, matched_type = stack.pop()
+            if level == 0:
+                tokens.append(TokenWithType(piece,
+                                            start,
+                                            start + len(piece),
+                                            TOKEN_TYPE_CODES[matched_type]))
+                continue
+            if level == 4:
+                tokens.extend(self._top_down_level_4(piece, start))
+                continue
+
+            if level == 1:
+                can_split = '.' in piece or '://' in piece
+                regexp = self.profile.ALL_WEB_CAPTURED_RE
+            elif level == 2:
+                can_split = self.profile.DIGIT_RE.search(piece) is not None
+                regexp = self.profile.DIGITS_CAPTURED_RE
+            else:
+                can_split = True
+                regexp = self.profile.WORD_BF_CAPTURED_RE
+            sub_phrases = [sub_phrase
+                           for sub_phrase in regexp.split(piece)
+                           if sub_phrase != ''] if can_split else []
+
+            if len(sub_phrases) < 2:
+                # nothing split off, the piece is known not to match
+                stack.append((piece, start, level + 1, None))
+                continue
+            children = []
+            for sub_phrase in sub_phrases:
+                matched_type = self._phrase_full_match(sub_phrase)
+                if matched_type is not None:
+                    children.append((sub_phrase, start, 0, matched_type))
+                else:
+                    children.append((sub_phrase, start, level + 1, None))
+                start += len(sub_phrase)
+            stack.extend(reversed(children))
+        return tokens
+
+    def _split_long_phrase(self, phrase, offset=0):
+        '''
+        linear time splitter for phrases longer than max_phrase_length:
+        level 3 and level 4 only, urls, emails and digits are not split off
+        '''
+        for sub_phrase in self.profile.WORD_BF_CAPTURED_RE.split(phrase):
+            if sub_phrase == '':
+                continue
+
+            length_sub_phrase = len(sub_phrase)
+            matched_type = self._phrase_full_match(sub_phrase)
+            if matched_type is not None:
+                yield TokenWithType(sub_phrase,
+                                    offset,
+                                    offset + length_sub_phrase,
+                                    TOKEN_TYPE_CODES[matched_type])
+            else:
+                for token in self._top_down_level_4(sub_phrase, offset):
+                    yield token
+            offset += length_sub_phrase
 
     def _has_end_of_phrase_punc(self, phrase):
         end_char_is_punc = False
-        if phrase[-1] in Patterns.PUNCT_END_PHRASE:
+        if phrase[-1] in self.profile.PUNCT_END_PHRASE:
             end_char_is_punc = True
-            if Patterns.ABBREV_RE.fullmatch(phrase):
+            if phrase[-1] == '.' and self.profile.ABBREV_RE.fullmatch(phrase):
                 end_char_is_punc = False
         return end_char_is_punc
 
@@ -165,15 +453,19 @@ class Tokenizer():
             matched_type = 'single_char'
         elif phrase.isalpha():
             matched_type = 'word'
-        elif phrase in Patterns.si_units:
+        elif phrase in self.profile.si_units:
             matched_type = 'unit'
-        elif Patterns.DIGITS_RE.fullmatch(phrase):
+        elif self.profile.may_be_digits(phrase) and \
+                self.profile.DIGITS_RE.fullmatch(phrase):
             matched_type = 'digit'
-        elif Patterns.PARA_SEP_RE.fullmatch(phrase):
+        elif self.profile.may_be_para_sep(phrase) and \
+                self.profile.PARA_SEP_RE.fullmatch(phrase):
             matched_type = 'punctuation_seq'
-        elif Patterns.abbreviation(phrase):
+        elif self.profile.abbreviation(phrase):
             matched_type = 'abbreviation'
-        elif Patterns.ALL_WEB_RE.fullmatch(phrase):
+        elif self.profile.may_be_web(phrase) and \
+                not self._is_long_phrase(phrase) and \
+                self.profile.ALL_WEB_RE.fullmatch(phrase):
             matched_type = 'url/email'
         return matched_type
 
@@ -188,13 +480,336 @@ class Tokenizer():
         '''
         return [token.text for token in self._tokenize(text)]
 
-    def tokenize_with_pos_info(self, text):
+    def tokenize_with_pos_info(self, text, with_type=False):
         '''
         tokenize
 
         params:
             - text: string
+            - with_type: output TokenWithType objects, with the TokenType
+              code found while splitting, no token is classified again
         output:
             - a list of Token object
         '''
+        if with_type:
+            return list(self._tokenize_with_type(text))
         return list(self._tokenize(text))
+
+    def tokenize_normalized(self, text):
+        '''
+        normalize the chars as normalizer.normalize_chars and tokenize in
+        one pass, phrase by phrase, without a normalized copy of the text.
+        A token keeps its normalized text, its positions refer to text: a
+        char decomposed into several chars, like '½', is covered as a whole
+        by every token taking part of it.
+
+        params:
+            - text: string
+        output:
+            - a list of Token object
+        '''
+        return [TokenWithPos(token_text,
+                             start + token_start,
+                             start + token_end)
+                for start, splits in self._normalized_phrase_splits(text)
+                for token_text, token_start, token_end, _ in splits]
+
+    def tokenize_sentences(self, text):
+        '''
+        tokenize and find the sentence boundaries in the same pass. A
+        sentence ends after a standalone '.', '?' or '!' token, together
+        with the end tokens and closing quotes or brackets glued to it.
+        Abbreviations, digits, urls and emails keep their dots as part of
+        the token, so they do not end a sentence.
+
+        params:
+            - text: string
+        output:
+            - (tokens, sentences): the list of Token object, and a list of
+              (start, end) token index ranges, one per sentence
+        '''
+        sentence_end = self.profile.SENTENCE_END
+        sentence_close = self.profile.SENTENCE_CLOSE
+        tokens = []
+        sentences = []
+        sentence_start = 0
+        ended = False
+        for token in self._tokenize(text):
+            if ended and token.text not in sentence_end and not (
+                    token.text in sentence_close and
+                    token.start == tokens[-1].end):
+                sentences.append((sentence_start, len(tokens)))
+                sentence_start = len(tokens)
+                ended = False
+            tokens.append(token)
+            if token.text in sentence_end:
+                ended = True
+        if sentence_start < len(tokens):
+            sentences.append((sentence_start, len(tokens)))
+        return tokens, sentences
+
+    def iter_tokens(self, text, with_pos=False, max_tokens=None):
+        '''
+        tokenize lazily, the text is only scanned as far as the tokens are
+        consumed
+
+        params:
+            - text: string
+            - with_pos: output Token objects instead of strings
+            - max_tokens: stop after this many tokens, None for no limit
+        output:
+            - an iterator of tokens
+        '''
+        tokens = self._tokenize(text)
+        if max_tokens is not None:
+            tokens = islice(tokens, max_tokens)
+        if with_pos:
+            return tokens
+        return (token.text for token in tokens)
+
+    def retokenize(self, text, tokens, offset, deleted_length, inserted_text):
+        '''
+        update the tokens of a text after an edit, only the whitespace
+        delimited phrases touched by the edit are tokenized again, the
+        positions of the tokens after them are shifted
+
+        params:
+            - text: the text before the edit
+            - tokens: list of Token objects of text, updated in place
+            - offset: position of the edit in text
+            - deleted_length: number of chars removed at offset
+            - inserted_text: string inserted at offset
+        output:
+            - tokens, now the tokens of the edited text
+        '''
+        region_start = offset
+        while region_start > 0 and not text[region_start - 1].isspace():
+            region_start -= 1
+        region_end = offset + deleted_length
+        while region_end < len(text) and not text[region_end].isspace():
+            region_end += 1
+        region = text[region_start:offset] + inserted_text + \
+            text[offset + deleted_length:region_end]
+
+        first = _bisect_start(tokens, region_start)
+        last = _bisect_start(tokens, region_end, first)
+        shift = len(inserted_text) - deleted_length
+        if shift:
+            for index in range(last, len(tokens)):
+                token = tokens[index]
+                token.start += shift
+                token.end += shift
+        tokens[first:last] = self._tokenize(region, region_start)
+        return tokens
+
+    def tokenize_offsets(self, text):
+        '''
+        tokenize, output only the token spans, without Token objects
+
+        params:
+            - text: string
+        output:
+            - (starts, ends): two array('l') of token start and end positions
+        '''
+        starts = array('l')
+        ends = array('l')
+        for start, splits in self._phrase_splits(text):
+            for _, token_start, token_end, _ in splits:
+                starts.append(start + token_start)
+                ends.append(start + token_end)
+        return starts, ends
+
+    def tokenize_into(self, text, out, offset=0):
+        '''
+        tokenize, write the token spans into a reusable buffer, no Token
+        object or list is created, and cached phrases produce no string
+
+        params:
+            - text: string
+            - out: TokenBuffer, overwritten, grown when too small
+            - offset: added to all positions
+        output:
+            - number of tokens, also set as out.size
+        '''
+        starts = out.starts
+        ends = out.ends
+        capacity = len(starts)
+        count = 0
+        for start, splits in self._phrase_splits(text, offset):
+            if count + len(splits) > capacity:
+                # the arrays grow in place
+                out.reserve(count + len(splits))
+                capacity = len(starts)
+            for _, token_start, token_end, _ in splits:
+                starts[count] = start + token_start
+                ends[count] = start + token_end
+                count += 1
+        out.size = count
+        return count
+
+    def encode(self, text, vocab, out=None):
+        '''
+        tokenize and map the tokens to their vocabulary ids, no token list
+        is built
+
+        params:
+            - text: string
+            - vocab: Vocabulary or MappedVocabulary from easy_tokenizer.vocab
+            - out: array('I') to append the ids to, a new one if None
+        output:
+            - array('I') of ids, 0 for tokens out of vocabulary
+        '''
+        ids = array('I') if out is None else out
+        lookup = vocab.lookup
+        for _, splits in self._phrase_splits(text):
+            for token_text, _, _, _ in splits:
+                ids.append(lookup(token_text))
+        return ids
+
+    def tokenize_stream(self, chunks):
+        '''
+        tokenize a stream of text chunks lazily
+
+        params:
+            - chunks: iterable of (offset, text) pairs, each text ending on
+              a whitespace boundary, e.g. from reader.iter_chunks
+        output:
+            - a generator of Token objects, positions are relative to the
+              whole stream
+        '''
+        for offset, chunk in chunks:
+            for token in self._tokenize(chunk, offset):
+                yield token
+
+    def tokenize_batch(self, texts, workers=1,
+                       chunksize=parallel.DEFAULT_CHUNKSIZE, with_pos=False):
+        '''
+        tokenize a batch of texts, optionally in a pool of processes
+
+        params:
+            - texts: iterable of strings
+            - workers: number of worker processes, 1 to run in this process
+            - chunksize: number of texts sent to a worker at a time
+            - with_pos: output Token objects instead of strings
+        output:
+            - a list of token lists, in the same order as texts
+        '''
+        if workers <= 1:
+            tokenize = self.tokenize_with_pos_info if with_pos \
+                else self.tokenize
+            return [tokenize(text) for text in texts]
+
+        results = parallel.imap_tokenize(self, texts, workers,
+                                         chunksize, with_pos)
+        if with_pos:
+            return [[TokenWithPos(*token) for token in tokens]
+                    for tokens in results]
+        return list(results)
+
+    def tokenize_file(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        '''
+        tokenize a utf-8 file lazily, the file is memory mapped and decoded
+        chunk by chunk instead of being read into memory
+
+        params:
+            - path: regular utf-8 text file, a pipe raises ValueError, see
+              tokenize_stream
+            - chunk_size: number of bytes to decode at a time
+        output:
+            - a generator of Token objects with char positions and byte
+              positions in the file
+        '''
+        for offset, byte_offset, chunk in iter_file_chunks(path, chunk_size):
+            byte_offsets = ByteOffsets(chunk, byte_offset)
+            for start, splits in self._phrase_splits(chunk):
+                for token_text, token_start, token_end, _ in splits:
+                    token_start += start
+                    token_end += start
+                    yield TokenWithBytePos(token_text,
+                                           offset + token_start,
+                                           offset + token_end,
+                                           byte_offsets(token_start),
+                                           byte_offsets(token_end))
+
+    def tokenize_large(self, text_or_path, workers=2, chunk_size=None):
+        '''
+        tokenize one large document in a pool of processes, the document
+        is cut on whitespace and the ranges are tokenized in parallel, the
+        tokens are the same as tokenize_with_pos_info in one process
+
+        params:
+            - text_or_path: string with the text, or os.PathLike, like
+              pathlib.Path, of a regular utf-8 file, whose line ends are
+              kept as they are, as in tokenize_file
+            - workers: number of worker processes, 1 to run in this process
+            - chunk_size: number of bytes tokenized by a worker at a time,
+              by default about 4 ranges per worker
+        output:
+            - a list of Token object, positions are relative to the whole
+              document
+        '''
+        if workers <= 1:
+            if isinstance(text_or_path, os.PathLike):
+                return [TokenWithPos(token.text, token.start, token.end)
+                        for token in self.tokenize_file(text_or_path)]
+            return self.tokenize_with_pos_info(text_or_path)
+
+        return [TokenWithPos(token_text, offset + start, offset + end)
+                for offset, texts, starts, ends in
+                parallel.imap_tokenize_large(self, text_or_path, workers,
+                                             chunk_size)
+                for token_text, start, end in zip(texts, starts, ends)]
+
+    def _tokenize_chunk(self, text, offset=0):
+        return list(self._tokenize(text, offset))
+
+    async def atokenize(self, text, executor=None):
+        '''
+        tokenize without blocking the event loop
+
+        params:
+            - text: string
+            - executor: concurrent.futures executor running the tokenizer,
+              the default executor of the event loop if None
+        output: tokens
+        '''
+        loop = get_running_loop()
+        return await loop.run_in_executor(executor, self.tokenize, text)
+
+    async def atokenize_stream(self, chunks, executor=None):
+        '''
+        tokenize an async stream of text chunks without blocking the event
+        loop. A chunk is only read once the tokens of the previous one are
+        consumed, so a slow consumer slows down the producer.
+
+        params:
+            - chunks: async iterable of strings, split anywhere
+            - executor: concurrent.futures executor running the tokenizer,
+              the default executor of the event loop if None
+        output:
+            - an async generator of Token objects, positions are relative
+              to the whole stream
+        '''
+        loop = get_running_loop()
+        offset = 0
+        pending = []
+        async for data in chunks:
+            boundary = last_boundary(data)
+            if boundary == 0:
+                pending.append(data)
+                continue
+            pending.append(data[:boundary])
+            text = ''.join(pending)
+            pending = [data[boundary:]]
+            tokens = await loop.run_in_executor(
+                executor, self._tokenize_chunk, text, offset)
+            offset += len(text)
+            for token in tokens:
+                yield token
+
+        text = ''.join(pending)
+        if text:
+            tokens = await loop.run_in_executor(
+                executor, self._tokenize_chunk, text, offset)
+            for token in tokens:
+                yield token
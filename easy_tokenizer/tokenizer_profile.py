@@ -0,0 +1,127 @@
+'''Class for the vocabularies and derived patterns used by a Tokenizer'''
+import re
+from functools import lru_cache
+from .patterns import Patterns, _captured_pattern
+
+
+class TokenizerProfile:
+    '''
+    TokenizerProfile: vocabularies and boundary chars of a language or a
+    domain, all regexps and sets derived from them are built once, when
+    the profile is created. It exposes the same attributes as Patterns,
+    the default profile shares the compiled regexps of Patterns.
+
+    Parameters:
+        - name: name of the profile
+        - si_units: phrases kept as unit tokens
+        - months: month abbreviations, kept with their trailing '.'
+        - common_hyphen_start: words not split from a following hyphen
+        - punct_end_phrase: chars split from the end of a phrase
+        - extra_word_boundaries: chars splitting words, on top of the
+          default word boundaries of Patterns
+    '''
+    # shared by all profiles, they do not depend on the vocabularies
+    may_be_digits = staticmethod(Patterns.may_be_digits)
+    may_be_para_sep = staticmethod(Patterns.may_be_para_sep)
+    may_be_web = staticmethod(Patterns.may_be_web)
+
+    def __init__(self, name='default',
+                 si_units=Patterns.si_units,
+                 months=Patterns.months,
+                 common_hyphen_start=Patterns.COMMON_HYPHEN_START,
+                 punct_end_phrase=Patterns.PUNCT_END_PHRASE,
+                 extra_word_boundaries=''):
+        self.name = name
+        self.si_units = frozenset(si_units)
+        self.months = tuple(months)
+        self.MONTHS = frozenset(months)
+        self.COMMON_HYPHEN_START = frozenset(common_hyphen_start)
+        self.PUNCT_END_PHRASE = frozenset(punct_end_phrase)
+        self.extra_word_boundaries = extra_word_boundaries
+
+        for attr in ['DIGIT_RE', 'DIGITS_RE', 'DIGITS_CAPTURED_RE',
+                     'ALL_WEB_RE', 'ALL_WEB_CAPTURED_RE', 'HYPHEN_RE',
+                     'HYPHEN_CAPTURED_RE', 'PUNCT_SEQ_RE', 'PARA_SEP_RE',
+                     'SENTENCE_END', 'SENTENCE_CLOSE']:
+            setattr(self, attr, getattr(Patterns, attr))
+
+        if self.MONTHS == Patterns.MONTHS:
+            self.ABBREV_RE = Patterns.ABBREV_RE
+        else:
+            known_month_pn = r"(?:" + r"|".join(
+                re.escape(month) for month in self.months) + r")\."
+            self.ABBREV_RE = re.compile(
+                Patterns.repeat_abbrev_pn + r'|' + known_month_pn)
+
+        if extra_word_boundaries:
+            self.WORD_BF_CAPTURED_RE = re.compile(_captured_pattern(
+                Patterns.word_bf_pn + r'|[' +
+                re.escape(extra_word_boundaries) + r']'))
+        else:
+            self.WORD_BF_CAPTURED_RE = Patterns.WORD_BF_CAPTURED_RE
+
+    @property
+    def config(self):
+        '''hashable arguments the profile was created with'''
+        return (self.name,
+                tuple(sorted(self.si_units)),
+                self.months,
+                tuple(sorted(self.COMMON_HYPHEN_START)),
+                tuple(sorted(self.PUNCT_END_PHRASE)),
+                self.extra_word_boundaries)
+
+    def __reduce__(self):
+        # unpickled copies of the same profile share one instance per process
+        return (cached_profile, self.config)
+
+    def __repr__(self):
+        return "TokenizerProfile({})".format(self.name)
+
+    def abbreviation(self, phrase):
+        '''Patterns.abbreviation with the months of this profile'''
+        is_abbrev = False
+        if phrase[-1] == '.':
+            head = phrase[:-1]
+            if phrase[0].isupper() and head.isalpha() and len(head) < 4:
+                is_abbrev = True
+            elif head in self.MONTHS:
+                is_abbrev = True
+            elif '.' in head and self.ABBREV_RE.fullmatch(phrase):
+                is_abbrev = True
+        return is_abbrev
+
+
+@lru_cache(maxsize=None)
+def cached_profile(*config):
+    '''
+    TokenizerProfile created with the positional arguments config, built
+    only once per process for the same arguments
+    '''
+    return TokenizerProfile(*config)
+
+
+_PROFILES = {}
+
+
+def register_profile(profile):
+    '''
+    make profile available by its name to get_profile and Tokenizer
+
+    params:
+        - profile: TokenizerProfile
+    '''
+    _PROFILES[profile.name] = profile
+
+
+def get_profile(name='default'):
+    '''
+    registered profile by name, the default profile is built on first use
+
+    params:
+        - name: name of a registered profile
+    '''
+    if name not in _PROFILES:
+        if name != 'default':
+            raise KeyError('unknown tokenizer profile {}'.format(name))
+        register_profile(cached_profile(*TokenizerProfile().config))
+    return _PROFILES[name]
@@ -0,0 +1,269 @@
+'''
+Vocabularies mapping tokens to integer ids
+
+A vocabulary is saved in a compact binary file, memory mapped on load:
+
+    - header: magic b'ETVC', format version, number of tokens and number
+      of hash table slots, 4 byte little endian unsigned ints
+    - hash table: one slot per 4 bytes, token id + 1 or 0 when empty,
+      indexed by zlib.crc32 of the utf-8 token, linear probing
+    - offsets: number of tokens + 1 byte offsets of the tokens in the blob
+    - blob: all utf-8 encoded tokens, in id order
+
+The unknown token always has the id 0.
+'''
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from functools import lru_cache
+
+MAGIC = b'ETVC'
+VERSION = 1
+UNKNOWN = '<unk>'
+
+_HEADER = struct.Struct('<4sIII')
+
+
+def _table_size(count):
+    '''number of hash table slots, a power of 2 at least twice count'''
+    size = 1
+    while size < 2 * count:
+        size <<= 1
+    return size
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array('I', values)
+        values.byteswap()
+    return values
+
+
+class Vocabulary:
+    '''
+    Vocabulary: tokens with consecutive integer ids, in memory
+
+    Parameters:
+        - tokens: iterable of tokens, their ids follow the iteration order,
+          duplicates are ignored
+        - unknown: token with the id 0, given to tokens out of vocabulary
+    '''
+    def __init__(self, tokens=(), unknown=UNKNOWN):
+        self.unknown = unknown
+        self.ids = {unknown: 0}
+        self.tokens = [unknown]
+        for token in tokens:
+            if token not in self.ids:
+                self.ids[token] = len(self.tokens)
+                self.tokens.append(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self.ids
+
+    def lookup(self, token):
+        '''id of token, 0 if it is out of vocabulary'''
+        return self.ids.get(token, 0)
+
+    def token(self, token_id):
+        '''token with the id token_id'''
+        return self.tokens[token_id]
+
+    def encode(self, tokens, out=None):
+        '''
+        ids of tokens
+
+        params:
+            - tokens: iterable of tokens
+            - out: array('I') to append the ids to, a new one if None
+        output:
+            - array('I') of ids, numpy.frombuffer(ids, dtype=numpy.uint32)
+              gives a numpy view of it without copy
+        '''
+        ids = array('I') if out is None else out
+        get = self.ids.get
+        ids.extend(get(token, 0) for token in tokens)
+        return ids
+
+    def decode(self, ids):
+        '''list of the tokens of ids'''
+        return [self.token(token_id) for token_id in ids]
+
+    def save(self, path):
+        '''
+        save the vocabulary in the binary format, see load_vocabulary
+
+        params:
+            - path: output file
+        '''
+        encoded = [token.encode('utf-8') for token in self.tokens]
+        table = array('I', bytes(4 * _table_size(len(encoded))))
+        mask = len(table) - 1
+        offsets = array('I', [0])
+        for token_id, token in enumerate(encoded):
+            slot = zlib.crc32(token) & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = token_id + 1
+            offsets.append(offsets[-1] + len(token))
+
+        with open(path, 'wb') as output_f:
+            output_f.write(_HEADER.pack(MAGIC, VERSION,
+                                        len(encoded), len(table)))
+            _little_endian(table).tofile(output_f)
+            _little_endian(offsets).tofile(output_f)
+            for token in encoded:
+                output_f.write(token)
+
+
+class MappedVocabulary:
+    '''
+    MappedVocabulary: vocabulary read in place from a memory mapped file
+    saved by Vocabulary.save, only the tokens looked up are decoded. The
+    ids of the last looked up tokens are kept in an LRU cache, frequent
+    tokens are only searched once.
+
+    Parameters:
+        - path: vocabulary file
+        - cache_size: max number of tokens in the lookup cache
+    '''
+    DEFAULT_CACHE_SIZE = 1 << 16
+
+    def __init__(self, path, cache_size=DEFAULT_CACHE_SIZE):
+        with open(path, 'rb') as input_f:
+            if os.fstat(input_f.fileno()).st_size < _HEADER.size:
+                raise ValueError('{} is not a vocabulary file'.format(path))
+            self._mmap = mmap.mmap(input_f.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        magic, version, count, table_size = \
+            _HEADER.unpack_from(self._mmap)
+        table_start = _HEADER.size
+        offsets_start = table_start + 4 * table_size
+        self._blob_start = offsets_start + 4 * (count + 1)
+        # check the sizes before casting, a truncated file or a bad table
+        # size would fail later on a lookup
+        size = len(self._mmap)
+        valid = (magic == MAGIC and version == VERSION and count > 0 and
+                 table_size == _table_size(count) and
+                 self._blob_start <= size)
+        if valid:
+            # the last offset is the length of the blob
+            blob_size, = struct.unpack_from('<I', self._mmap,
+                                            self._blob_start - 4)
+            valid = self._blob_start + blob_size <= size
+        if not valid:
+            self._mmap.close()
+            raise ValueError('{} is not a vocabulary file'.format(path))
+        self._count = count
+        if sys.byteorder == 'little':
+            view = memoryview(self._mmap)
+            self._table = view[table_start:offsets_start].cast('I')
+            self._offsets = view[offsets_start:self._blob_start].cast('I')
+            view.release()
+        else:
+            self._table = array('I', self._mmap[table_start:offsets_start])
+            self._offsets = array(
+                'I', self._mmap[offsets_start:self._blob_start])
+            self._table.byteswap()
+            self._offsets.byteswap()
+        self._mask = table_size - 1
+        self._cached_search = lru_cache(maxsize=cache_size)(self._search)
+        self.unknown = self.token(0)
+
+    def close(self):
+        '''release the mapped file'''
+        if isinstance(self._table, memoryview):
+            self._table.release()
+            self._offsets.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, token):
+        return self.lookup(token) != 0 or token == self.unknown
+
+    def _token_bytes(self, token_id):
+        return self._mmap[self._blob_start + self._offsets[token_id]:
+                          self._blob_start + self._offsets[token_id + 1]]
+
+    def _search(self, token):
+        encoded = token.encode('utf-8')
+        slot = zlib.crc32(encoded) & self._mask
+        while self._table[slot]:
+            token_id = self._table[slot] - 1
+            if self._token_bytes(token_id) == encoded:
+                return token_id
+            slot = (slot + 1) & self._mask
+        return 0
+
+    def lookup(self, token):
+        '''id of token, 0 if it is out of vocabulary'''
+        return self._cached_search(token)
+
+    def token(self, token_id):
+        '''token with the id token_id'''
+        if not 0 <= token_id < self._count:
+            raise IndexError('token id {} out of range'.format(token_id))
+        return self._token_bytes(token_id).decode('utf-8')
+
+    def encode(self, tokens, out=None):
+        '''see Vocabulary.encode'''
+        ids = array('I') if out is None else out
+        ids.extend(self.lookup(token) for token in tokens)
+        return ids
+
+    def decode(self, ids):
+        '''list of the tokens of ids'''
+        return [self.token(token_id) for token_id in ids]
+
+
+def build_vocabulary(tokenizer, texts, min_count=1, max_size=None,
+                     unknown=UNKNOWN):
+    '''
+    build a vocabulary from the tokens of a corpus
+
+    params:
+        - tokenizer: Tokenizer object
+        - texts: iterable of strings
+        - min_count: keep tokens seen at least this many times
+        - max_size: keep at most this many tokens, unknown included, None
+          for no limit
+        - unknown: token for the tokens out of vocabulary
+    output:
+        - Vocabulary, ids by decreasing frequency, ties in token order
+    '''
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenizer.iter_tokens(text))
+    tokens = sorted((token for token, count in counts.items()
+                     if count >= min_count and token != unknown),
+                    key=lambda token: (-counts[token], token))
+    if max_size is not None:
+        tokens = tokens[:max(max_size - 1, 0)]
+    return Vocabulary(tokens, unknown)
+
+
+def load_vocabulary(path, cache_size=MappedVocabulary.DEFAULT_CACHE_SIZE):
+    '''
+    memory map a vocabulary saved by Vocabulary.save
+
+    params:
+        - path: vocabulary file
+        - cache_size: max number of tokens in the lookup cache
+    output:
+        - MappedVocabulary, close it to release the file
+    '''
+    return MappedVocabulary(path, cache_size)
@@ -30,6 +30,7 @@ setup(
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
     ],
+    python_requires='>=3.6',
     long_description=readme,
     test_suite="tests",
     setup_requires=setup_requirements,
@@ -0,0 +1,92 @@
+# -*coding: utf-8 -*-
+from unittest import TestCase
+from argparse import Namespace
+from contextlib import redirect_stderr
+from io import StringIO
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from easy_tokenizer.tokenizer import Tokenizer
+from easy_tokenizer.__main__ import (get_args, tokenize_jsonl,
+                                     InvalidRecordError)
+from easy_tokenizer.serialization import read_token_file
+
+
+class MainTestCases(TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+
+    def test_tokenize_jsonl(self):
+        records = [{'id': 1, 'text': 'hello, world 12.5%'},
+                   {'id': 2, 'body': 'über e-mail foo@bar.com.'},
+                   {'id': 3}]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'input.jsonl')
+            with open(filename, 'w', encoding='utf-8') as output_f:
+                for record in records:
+                    output_f.write(json.dumps(record) + '\n\n')
+
+            for workers in [None, 2]:
+                args = Namespace(filename=filename, field='body',
+                                 output_field='tok', with_pos=True,
+                                 workers=workers)
+                output_f = StringIO()
+                tokenize_jsonl(args, self.tokenizer, output_f)
+                self.assertEqual(
+                    [json.loads(line)
+                     for line in output_f.getvalue().splitlines()],
+                    [{'id': 1, 'text': 'hello, world 12.5%', 'tok': []},
+                     {'id': 2, 'body': 'über e-mail foo@bar.com.',
+                      'tok': [['über', 0, 4], ['e-mail', 5, 11],
+                              ['foo@bar.com', 12, 23], ['.', 23, 24]]},
+                     {'id': 3, 'tok': []}])
+
+    def test_invalid_records(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'input.jsonl')
+            args = Namespace(filename=filename, field='text',
+                             output_field='tokens', with_pos=False,
+                             workers=None)
+            for line, message in [
+                    ('[1, 2]', 'expected a JSON object'),
+                    ('{"text": 12}', 'field "text" should be a string'),
+                    ('{"text": ', 'invalid JSON')]:
+                with open(filename, 'w', encoding='utf-8') as output_f:
+                    output_f.write('{"text": "a b"}\n\n' + line + '\n')
+                with self.assertRaisesRegex(InvalidRecordError,
+                                            'line 3: ' + message):
+                    tokenize_jsonl(args, self.tokenizer, StringIO())
+
+    def test_pipe_input(self):
+        # /dev/stdin is a pipe here, whose size is reported as 0
+        text = 'hello, world.\nüber e-mail'
+        command = [sys.executable, '-m', 'easy_tokenizer', '-f', '/dev/stdin']
+        process = subprocess.run(command, input=text.encode('utf-8'),
+                                 stdout=subprocess.PIPE, check=True)
+        self.assertEqual(process.stdout.decode('utf-8'),
+                         'hello , world . über e-mail\n')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'tokens.bin')
+            subprocess.run(command + ['--format', 'bin', '-o', filename],
+                           input=text.encode('utf-8'), check=True)
+            with read_token_file(filename) as reader:
+                self.assertEqual(
+                    [(token.text, token.start, token.end)
+                     for token in reader],
+                    [(token.text, token.start, token.end)
+                     for token in self.tokenizer.tokenize_with_pos_info(
+                         text)])
+
+    def test_get_args(self):
+        self.assertEqual(get_args(['-f', 'input.txt', '-w', '2']).workers, 2)
+        for argv, message in [(['-f', 'input.txt', '-w', '0'],
+                               'should be at least 1'),
+                              (['-s', 'some text', '-w', '2'],
+                               'needs an input file')]:
+            error_f = StringIO()
+            with redirect_stderr(error_f), self.assertRaises(SystemExit):
+                get_args(argv)
+            self.assertIn('--workers ' + message, error_f.getvalue())
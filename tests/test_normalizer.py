@@ -0,0 +1,50 @@
+# -*coding: utf-8 -*-
+from unittest import TestCase
+import random
+import unicodedata
+from easy_tokenizer.normalizer import (normalize_chars,
+                                       normalize_chars_with_offsets,
+                                       normalize_batch)
+
+
+def reference_normalize_chars(text):
+    return ''.join(char for char in unicodedata.normalize('NFKD', text)
+                   if unicodedata.category(char) != 'Mn')
+
+
+class NormalizerTestCases(TestCase):
+    def setUp(self):
+        generator = random.Random(3)
+        chars = 'aeoAZ09 .,-\n' + 'éèêëçñøåÅÉİğşœæßﬁ½²№' + '́̈'
+        self.texts = ['Hurmoğlu, Botaş BTC', 'Français : Niveau élevé',
+                      'plain ascii text', ''] + [
+            ''.join(generator.choice(chars)
+                    for _ in range(generator.randint(0, 30)))
+            for _ in range(500)]
+
+    def test_normalize_chars(self):
+        self.assertEqual(normalize_chars('Français : Niveau élevé'),
+                         'Francais : Niveau eleve')
+        for text in self.texts:
+            self.assertEqual(normalize_chars(text),
+                             reference_normalize_chars(text))
+
+    def test_normalize_chars_with_offsets(self):
+        normalized, offsets = normalize_chars_with_offsets('ﬁn élevé')
+        self.assertEqual(normalized, 'fin eleve')
+        self.assertEqual(list(offsets), [0, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+        for text in self.texts:
+            normalized, offsets = normalize_chars_with_offsets(text)
+            self.assertEqual(normalized, normalize_chars(text))
+            self.assertEqual(len(offsets), len(normalized) + 1)
+            self.assertEqual(offsets[-1], len(text))
+            for position, char in enumerate(normalized):
+                self.assertIn(char,
+                              normalize_chars(text[offsets[position]]))
+
+    def test_normalize_batch(self):
+        self.assertEqual(normalize_batch(self.texts),
+                         [normalize_chars(text) for text in self.texts])
+        self.assertEqual(
+            normalize_batch(self.texts, with_offsets=True),
+            [normalize_chars_with_offsets(text) for text in self.texts])
@@ -98,3 +98,25 @@ class PatternsTestCases(TestCase):
                 tokens,
                 expected_tokens[index]
             )
+
+    def test_pre_checks(self):
+        text = ['123.21', '-12', '+x1', 'a12', '-----', '.....', '_____',
+                'www.foo.bar', 'http://localhost', 'foo@bar', 'Sept.']
+        regexps = [(Patterns.may_be_digits, Patterns.DIGITS_RE),
+                   (Patterns.may_be_para_sep, Patterns.PARA_SEP_RE),
+                   (Patterns.may_be_web, Patterns.ALL_WEB_RE)]
+        for phrase in text:
+            for pre_check, regexp in regexps:
+                # a failed pre-check must mean the regexp can not match
+                if regexp.fullmatch(phrase):
+                    self.assertTrue(pre_check(phrase))
+        self.assertFalse(Patterns.may_be_digits('a12'))
+        self.assertFalse(Patterns.may_be_para_sep('_____'))
+        self.assertFalse(Patterns.may_be_web('foo@bar'))
+        self.assertTrue(Patterns.abbreviation('Sept.'))
+
+    def test_lazy_regexp(self):
+        regexp = Patterns.YEAR_RE
+        self.assertIs(Patterns.YEAR_RE, regexp)
+        self.assertIs(Patterns.__dict__['YEAR_RE'], regexp)
+        self.assertTrue(regexp.fullmatch('2019'))
@@ -0,0 +1,64 @@
+# -*coding: utf-8 -*-
+from unittest import TestCase
+import os
+import tempfile
+from easy_tokenizer.tokenizer import Tokenizer
+from easy_tokenizer.serialization import (TokenWriter, write_token_file,
+                                          read_token_file)
+
+
+class SerializationTestCases(TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+        self.text = 'see http://www.foo.com, 12.5% of über ½ ' + \
+            'foo ' * 100 + 'x' * 300
+
+    @staticmethod
+    def spans(tokens):
+        return [token if isinstance(token, tuple) else
+                (token.text, token.start, token.end) for token in tokens]
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'tokens.bin')
+            for tokens in [self.tokenizer.tokenize_with_pos_info(self.text),
+                           self.tokenizer.tokenize_normalized(self.text),
+                           [('a', 5, 6), ('b', 0, 1), ('a', 1000, 1001)],
+                           []]:
+                self.assertEqual(write_token_file(path, tokens), len(tokens))
+                with read_token_file(path) as reader:
+                    self.assertEqual(len(reader), len(tokens))
+                    self.assertEqual(self.spans(reader), self.spans(tokens))
+                    self.assertEqual(list(reader.spans()),
+                                     [(start, end) for _, start, end
+                                      in self.spans(tokens)])
+
+    def test_writer(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'tokens.bin')
+            with open(path, 'wb') as output_f, \
+                    TokenWriter(output_f) as writer:
+                writer.write_all(self.tokenizer.iter_tokens(
+                    self.text, with_pos=True))
+            with read_token_file(path) as reader:
+                self.assertEqual(
+                    self.spans(reader),
+                    self.spans(self.tokenizer.tokenize_with_pos_info(
+                        self.text)))
+                self.assertEqual(len(reader.strings), 9)
+            self.assertLess(os.path.getsize(path), len(self.text))
+
+            def failing_tokens():
+                yield 'a', 0, 1
+                yield 'b', 2, 3
+                raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid')
+
+            with self.assertRaises(UnicodeDecodeError):
+                write_token_file(path, failing_tokens())
+            with self.assertRaises(ValueError):
+                read_token_file(path)
+
+            with open(path, 'wb') as output_f:
+                output_f.write(b'ETOC' + bytes(40))
+            with self.assertRaises(ValueError):
+                read_token_file(path)
@@ -0,0 +1,106 @@
+# -*coding: utf-8 -*-
+from unittest import TestCase
+from io import BytesIO
+import errno
+import json
+import os
+import socket
+import tempfile
+import threading
+from easy_tokenizer.tokenizer import Tokenizer
+from easy_tokenizer.server import (TokenizerService, TokenizerServer,
+                                   read_frame, write_frame)
+
+
+class ServerTestCases(TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+        self.texts = ['hello, world 12.5%', '', 'über e-mail foo@bar.com.']
+
+    @staticmethod
+    def frame(request):
+        output_f = BytesIO()
+        write_frame(output_f, json.dumps(request).encode('utf-8'))
+        return output_f.getvalue()
+
+    @staticmethod
+    def responses(data):
+        input_f = BytesIO(data)
+        responses = []
+        while True:
+            payload = read_frame(input_f)
+            if payload is None:
+                return responses
+            responses.append(json.loads(payload.decode('utf-8')))
+
+    def test_serve_stream(self):
+        requests = self.frame({'texts': self.texts}) + \
+            self.frame({'texts': self.texts[2:], 'with_pos': True}) + \
+            self.frame({'text': 'foo'}) + b'\x00\x00\x00\x02{'
+        for workers in [1, 2]:
+            output_f = BytesIO()
+            with TokenizerService(self.tokenizer, workers) as service:
+                service.serve_stream(BytesIO(requests), output_f)
+            responses = self.responses(output_f.getvalue())
+            self.assertEqual(responses[:2], [
+                {'tokens': [['hello', ',', 'world', '12.5%'], [],
+                            ['über', 'e-mail', 'foo@bar.com', '.']]},
+                {'tokens': [[['über', 0, 4], ['e-mail', 5, 11],
+                             ['foo@bar.com', 12, 23], ['.', 23, 24]]]}])
+            self.assertEqual(len(responses), 3)
+            self.assertIn('error', responses[2])
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                TokenizerService(self.tokenizer) as service:
+            path = os.path.join(tmp_dir, 'tokenizer.sock')
+            with TokenizerServer(path, service) as server:
+                thread = threading.Thread(target=server.serve_forever)
+                thread.start()
+                try:
+                    with socket.socket(socket.AF_UNIX) as client:
+                        client.connect(path)
+                        with client.makefile('rwb') as client_f:
+                            for _ in range(2):
+                                write_frame(client_f, json.dumps(
+                                    {'texts': self.texts}).encode('utf-8'))
+                                payload = read_frame(client_f)
+                                self.assertEqual(
+                                    json.loads(payload.decode('utf-8')),
+                                    {'tokens': [
+                                        self.tokenizer.tokenize(text)
+                                        for text in self.texts]})
+                finally:
+                    server.shutdown()
+                    thread.join()
+            self.assertFalse(os.path.exists(path))
+
+    def test_socket_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                TokenizerService(self.tokenizer) as service:
+            path = os.path.join(tmp_dir, 'notes.txt')
+            with open(path, 'w') as output_f:
+                output_f.write('notes')
+            with self.assertRaises(FileExistsError):
+                TokenizerServer(path, service)
+            self.assertTrue(os.path.isfile(path))
+
+            # a stale socket is replaced
+            path = os.path.join(tmp_dir, 'tokenizer.sock')
+            with socket.socket(socket.AF_UNIX) as stale:
+                stale.bind(path)
+            with TokenizerServer(path, service):
+                self.assertTrue(os.path.exists(path))
+                os.unlink(path)
+                with open(path, 'w') as output_f:
+                    output_f.write('notes')
+            self.assertTrue(os.path.isfile(path))
+
+            # the socket of a running server is kept
+            path = os.path.join(tmp_dir, 'running.sock')
+            with TokenizerServer(path, service):
+                inode = os.lstat(path).st_ino
+                with self.assertRaises(OSError) as context:
+                    TokenizerServer(path, service)
+                self.assertEqual(context.exception.errno, errno.EADDRINUSE)
+                self.assertEqual(os.lstat(path).st_ino, inode)
@@ -1,6 +1,19 @@
 # -*coding: utf-8 -*-
 from unittest import TestCase
+from io import StringIO
+import os
+import pathlib
+import tempfile
+import asyncio
+import random
+import pickle
 from easy_tokenizer.tokenizer import Tokenizer
+from easy_tokenizer.tokenizer_profile import (TokenizerProfile,
+                                              register_profile, get_profile)
+from easy_tokenizer.reader import iter_chunks
+from easy_tokenizer.token_buffer import TokenBuffer
+from easy_tokenizer.token_with_pos import TokenType, TOKEN_TYPE_CODES
+from easy_tokenizer.normalizer import normalize_chars
 
 
 class TokenizerTestCases(TestCase):
@@ -253,6 +266,361 @@ try this one https://docs.google.com/document/d/1pd/edit?ts=5da580bc'''
                 expected_tokens[index]
             )
 
+    def test_tokenize_stream(self):
+        text = '\n'.join(self.get_url_text())
+        expected_tokens = [
+            (token.text, token.start, token.end)
+            for token in self.tokenizer.tokenize_with_pos_info(text)]
+        for chunk_size in [1, 7, 64, 100000]:
+            chunks = iter_chunks(StringIO(text), chunk_size)
+            tokens = [(token.text, token.start, token.end)
+                      for token in self.tokenizer.tokenize_stream(chunks)]
+            self.assertEqual(tokens, expected_tokens)
+
+    def test_tokenize_file(self):
+        text = 'Hurmoğlu, Botaş BTC, 2002\r\nCoordination «foo» élevé\n' + \
+            '\n'.join(self.get_url_text())
+        expected_tokens = [
+            (token.text, token.start, token.end)
+            for token in self.tokenizer.tokenize_with_pos_info(text)]
+        data = text.encode('utf-8')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'input.txt')
+            with open(filename, 'wb') as output_f:
+                output_f.write(data)
+            for chunk_size in [1, 7, 64, 100000]:
+                tokens = list(self.tokenizer.tokenize_file(filename,
+                                                           chunk_size))
+                self.assertEqual(
+                    [(token.text, token.start, token.end)
+                     for token in tokens],
+                    expected_tokens)
+                self.assertEqual(
+                    [data[token.byte_start:token.byte_end].decode('utf-8')
+                     for token in tokens],
+                    [token[0] for token in expected_tokens])
+
+            with open(filename, 'wb'):
+                pass
+            self.assertEqual(list(self.tokenizer.tokenize_file(filename)),
+                             [])
+
+        # a device reports a size of 0, it should not look empty
+        with self.assertRaisesRegex(ValueError, 'not a regular file'):
+            list(self.tokenizer.tokenize_file(os.devnull))
+
+    def test_tokenize_large(self):
+        text = '\r\n'.join(self.get_random_text(300) + self.get_url_text() +
+                           [self.get_long_url_text()])
+        tokens = [(token.text, token.start, token.end)
+                  for token in self.tokenizer.tokenize_with_pos_info(text)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'input.txt')
+            with open(filename, 'w', encoding='utf-8', newline='') \
+                    as output_f:
+                output_f.write(text)
+            for text_or_path in [text, pathlib.Path(filename)]:
+                for workers, chunk_size in [(1, None), (2, None), (3, 100)]:
+                    self.assertEqual(
+                        [(token.text, token.start, token.end)
+                         for token in self.tokenizer.tokenize_large(
+                             text_or_path, workers, chunk_size)],
+                        tokens)
+            self.assertEqual(self.tokenizer.tokenize_large('', 2), [])
+            with self.assertRaisesRegex(ValueError, 'not a regular file'):
+                self.tokenizer.tokenize_large(pathlib.Path(os.devnull), 2)
+
+    def test_tokenize_batch(self):
+        text = self.get_url_text()
+        expected_tokens = [self.tokenizer.tokenize(phrase) for phrase in text]
+        self.assertEqual(self.tokenizer.tokenize_batch(text), expected_tokens)
+        self.assertEqual(
+            self.tokenizer.tokenize_batch(text, workers=2, chunksize=2),
+            expected_tokens)
+        self.assertEqual(
+            [[(token.text, token.start, token.end) for token in tokens]
+             for tokens in self.tokenizer.tokenize_batch(
+                 text, workers=2, with_pos=True)],
+            [[(token.text, token.start, token.end)
+              for token in self.tokenizer.tokenize_with_pos_info(phrase)]
+             for phrase in text])
+
+    def test_phrase_cache(self):
+        text = 'the cat, the dog and the e.g. bird, 2019, 2019,'
+        tokenizer = Tokenizer(cache_size=4)
+        uncached_tokenizer = Tokenizer(cache_size=0)
+        self.assertEqual(
+            [(token.text, token.start, token.end)
+             for token in tokenizer.tokenize_with_pos_info(text)],
+            [(token.text, token.start, token.end)
+             for token in uncached_tokenizer.tokenize_with_pos_info(text)])
+        cache_info = tokenizer.cache_info()
+        self.assertEqual(cache_info.hits, 3)
+        self.assertEqual(cache_info.currsize, 4)
+        self.assertEqual(uncached_tokenizer.cache_info().hits, 0)
+        tokenizer.cache_clear()
+        self.assertEqual(tokenizer.cache_info().currsize, 0)
+
+    def test_stack_engine(self):
+        stack = Tokenizer(cache_size=0, engine='stack')
+        cascade = Tokenizer(cache_size=0, engine='cascade')
+        corpus = self.get_url_text() + [self.get_long_url_text()] + \
+            self.get_random_text(2000)
+        for text in corpus:
+            self.assertEqual(
+                [(token.text, token.start, token.end)
+                 for token in stack.tokenize_with_pos_info(text)],
+                [(token.text, token.start, token.end)
+                 for token in cascade.tokenize_with_pos_info(text)])
+        with self.assertRaises(ValueError):
+            Tokenizer(engine='foo')
+
+    def test_token_types(self):
+        text = 'see http://www.foo.com/bar, 12.5% of Aug. kg ... ' \
+            'foo@bar.com. ===== e-mail well-known'
+        self.assertEqual(
+            [(token.text, token.token_type)
+             for token in self.tokenizer.tokenize_with_pos_info(
+                 text, with_type=True)],
+            [('see', TokenType.WORD),
+             ('http://www.foo.com/bar', TokenType.URL_EMAIL),
+             (',', TokenType.SINGLE_CHAR), ('12.5%', TokenType.DIGIT),
+             ('of', TokenType.WORD), ('Aug.', TokenType.ABBREVIATION),
+             ('kg', TokenType.WORD), ('.', TokenType.SINGLE_CHAR),
+             ('.', TokenType.SINGLE_CHAR), ('.', TokenType.SINGLE_CHAR),
+             ('foo@bar.com', TokenType.URL_EMAIL),
+             ('.', TokenType.SINGLE_CHAR),
+             ('=====', TokenType.PUNCTUATION_SEQ),
+             ('e-mail', TokenType.OTHER), ('well', TokenType.WORD),
+             ('-', TokenType.SINGLE_CHAR), ('known', TokenType.WORD)])
+
+        corpus = self.get_url_text() + self.get_random_text(1000)
+        for engine in Tokenizer.ENGINES:
+            tokenizer = Tokenizer(engine=engine)
+            for text in corpus:
+                tokens = tokenizer.tokenize_with_pos_info(text, with_type=True)
+                self.assertEqual(
+                    [token.token_type for token in tokens],
+                    [TOKEN_TYPE_CODES[tokenizer._phrase_full_match(
+                        token.text)] for token in tokens])
+
+    def test_tokenize_offsets(self):
+        text = self.get_long_url_text()
+        tokens = self.tokenizer.tokenize_with_pos_info(text)
+        starts, ends = self.tokenizer.tokenize_offsets(text)
+        self.assertEqual(list(starts), [token.start for token in tokens])
+        self.assertEqual(list(ends), [token.end for token in tokens])
+        self.assertEqual([text[start:end] for start, end in zip(starts, ends)],
+                         [token.text for token in tokens])
+
+    def test_tokenize_into(self):
+        buffer = TokenBuffer(capacity=4)
+        texts = [self.get_long_url_text(), 'hello, world', '',
+                 ' '.join(self.get_url_text())]
+        for text in texts:
+            count = self.tokenizer.tokenize_into(text, buffer)
+            starts, ends = self.tokenizer.tokenize_offsets(text)
+            self.assertEqual(count, len(starts))
+            self.assertEqual(len(buffer), count)
+            self.assertEqual(list(buffer.spans()),
+                             list(zip(starts, ends)))
+            self.assertEqual(buffer.tokens(text),
+                             self.tokenizer.tokenize(text))
+        self.assertGreaterEqual(buffer.capacity, len(starts))
+        self.tokenizer.tokenize_into('a b', buffer, offset=10)
+        self.assertEqual(list(buffer.spans()), [(10, 11), (12, 13)])
+
+    def test_collect_stats(self):
+        text = 'see http://www.foo.com/bar, 12.5% of 2019 e-mail'
+        tokenizer = Tokenizer(collect_stats=True)
+        self.assertIsNone(self.tokenizer.stats)
+        self.assertEqual(tokenizer.tokenize(text),
+                         self.tokenizer.tokenize(text))
+        self.assertEqual(tokenizer.stats.calls['phrase'], 6)
+        self.assertEqual(tokenizer.stats.calls['url/email split'], 2)
+        self.assertEqual(tokenizer.stats.token_types['url_email'], 1)
+        tokenizer.tokenize('the the the the')
+        self.assertEqual(tokenizer.stats.token_types['word'], 6)
+        tokenizer.tokenize_normalized('thé')
+        self.assertEqual(tokenizer.stats.token_types['word'], 7)
+        self.assertGreaterEqual(tokenizer.stats.seconds['phrase'],
+                                tokenizer.stats.self_seconds['phrase'])
+        self.assertIn('phrase cache', tokenizer.stats.report(
+            tokenizer.cache_info()))
+        tokenizer.stats.reset()
+        self.assertEqual(tokenizer.stats.as_dict()['calls'], {})
+
+    def test_async_tokenize(self):
+        text = '\n'.join(self.get_url_text())
+        expected_tokens = [
+            (token.text, token.start, token.end)
+            for token in self.tokenizer.tokenize_with_pos_info(text)]
+
+        async def chunks(size):
+            for start in range(0, len(text), size):
+                yield text[start:start + size]
+
+        async def tokenize_stream(size):
+            return [(token.text, token.start, token.end)
+                    async for token in self.tokenizer.atokenize_stream(
+                        chunks(size))]
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(
+                loop.run_until_complete(self.tokenizer.atokenize(text)),
+                [token[0] for token in expected_tokens])
+            for size in [5, 100, 100000]:
+                self.assertEqual(loop.run_until_complete(
+                    tokenize_stream(size)), expected_tokens)
+        finally:
+            loop.close()
+
+    def test_profile(self):
+        text = '12 okt. 60 m/s anti-war een#exception'
+        self.assertEqual(
+            self.tokenizer.tokenize(text),
+            ['12', 'okt', '.', '60', 'm', '/', 's', 'anti', '-', 'war',
+             'een#exception'])
+        profile = TokenizerProfile(
+            name='test',
+            si_units=['m/s'],
+            months=['okt'],
+            common_hyphen_start=['anti'],
+            extra_word_boundaries='#')
+        tokenizer = Tokenizer(profile=profile)
+        self.assertEqual(
+            tokenizer.tokenize(text),
+            ['12', 'okt.', '60', 'm/s', 'anti-war', 'een', '#', 'exception'])
+
+        # unpickled copies share one profile, and do not recompile it
+        copies = pickle.loads(pickle.dumps([tokenizer, tokenizer.profile]))
+        self.assertIs(copies[0].profile, copies[1])
+        self.assertIs(pickle.loads(pickle.dumps(copies[1])), copies[1])
+        self.assertEqual(copies[0].tokenize(text), tokenizer.tokenize(text))
+
+        register_profile(profile)
+        self.assertIs(Tokenizer(profile='test').profile, profile)
+        self.assertIs(Tokenizer().profile, get_profile('default'))
+        with self.assertRaises(KeyError):
+            Tokenizer(profile='foo')
+
+    def test_tokenize_sentences(self):
+        text = 'Mr. Smith paid 12.5 euro at B.V. Foo on 3 Aug. 2019. ' \
+            'He said (see www.foo.com): "Really?!" Yes... ' \
+            '"No" was the answer. And no end'
+        tokens, sentences = self.tokenizer.tokenize_sentences(text)
+        self.assertEqual([(token.text, token.start, token.end)
+                          for token in tokens],
+                         [(token.text, token.start, token.end)
+                          for token in self.tokenizer.tokenize_with_pos_info(
+                              text)])
+        self.assertEqual(
+            [' '.join(token.text for token in tokens[start:end])
+             for start, end in sentences],
+            ['Mr. Smith paid 12.5 euro at B.V. Foo on 3 Aug. 2019 .',
+             'He said ( see www.foo.com ) : " Really ? ! "',
+             'Yes . . .',
+             '" No " was the answer .',
+             'And no end'])
+        self.assertEqual(self.tokenizer.tokenize_sentences(' '), ([], []))
+        tokens, sentences = self.tokenizer.tokenize_sentences(
+            'He left.“Hi there.”')
+        self.assertEqual(
+            [[token.text for token in tokens[start:end]]
+             for start, end in sentences],
+            [['He', 'left', '.'], ['“', 'Hi', 'there', '.', '”']])
+
+    def test_iter_tokens(self):
+        text = 'een mooie test zin. ' * 1000
+        tokenizer = Tokenizer(collect_stats=True)
+        self.assertEqual(list(tokenizer.iter_tokens(text, max_tokens=6)),
+                         ['een', 'mooie', 'test', 'zin', '.', 'een'])
+        # only the phrases needed for the first tokens were scanned
+        self.assertEqual(tokenizer.stats.calls['phrase'], 5)
+        self.assertEqual(
+            [(token.text, token.start, token.end)
+             for token in tokenizer.iter_tokens(text, with_pos=True,
+                                                max_tokens=2)],
+            [('een', 0, 3), ('mooie', 4, 9)])
+        self.assertEqual(list(tokenizer.iter_tokens(text)),
+                         tokenizer.tokenize(text))
+
+    def test_retokenize(self):
+        generator = random.Random(7)
+        text = ' '.join(self.get_url_text())
+        tokens = self.tokenizer.tokenize_with_pos_info(text)
+        edits = self.get_random_text(200, seed=7) + ['', ' ', 'foo bar']
+        for inserted_text in edits:
+            offset = generator.randint(0, len(text))
+            deleted_length = generator.randint(0, min(20, len(text) - offset))
+            tokens = self.tokenizer.retokenize(
+                text, tokens, offset, deleted_length, inserted_text)
+            text = text[:offset] + inserted_text + \
+                text[offset + deleted_length:]
+            self.assertEqual(
+                [(token.text, token.start, token.end) for token in tokens],
+                [(token.text, token.start, token.end)
+                 for token in self.tokenizer.tokenize_with_pos_info(text)])
+
+    def test_tokenize_normalized(self):
+        text = 'Hurmoğlu, Botaş BTC, ½ café-crème\n' \
+            'NADİ e\u0301t\u00e9 \ufb01n.'
+        tokens = self.tokenizer.tokenize_normalized(text)
+        self.assertEqual(
+            [(token.text, text[token.start:token.end]) for token in tokens],
+            [('Hurmoglu', 'Hurmoğlu'), (',', ','), ('Botas', 'Botaş'),
+             ('BTC', 'BTC'), (',', ','), ('1', '½'), ('⁄', '½'), ('2', '½'),
+             ('cafe', 'café'), ('-', '-'), ('creme', 'crème'),
+             ('NADI', 'NADİ'), ('ete', 'e\u0301t\u00e9'),
+             ('fin', '\ufb01n'), ('.', '.')])
+        # combining marks after the last char of a token belong to it
+        for text, expected_tokens in [
+                ('cafe\u0301 ok', [('cafe', 0, 5), ('ok', 6, 8)]),
+                ('x cafe\u0301.', [('x', 0, 1), ('cafe', 2, 7), ('.', 7, 8)])]:
+            self.assertEqual(
+                [(token.text, token.start, token.end)
+                 for token in self.tokenizer.tokenize_normalized(text)],
+                expected_tokens)
+        for text in self.get_random_text(500):
+            self.assertEqual(
+                [token.text
+                 for token in self.tokenizer.tokenize_normalized(text)],
+                self.tokenizer.tokenize(normalize_chars(text)))
+
+    def test_max_phrase_length(self):
+        tokenizer = Tokenizer(max_phrase_length=30, collect_stats=True)
+        text = 'see http://www.foo.com/' + 'a' * 20 + ' 12.5% ' + 'a@' * 2000
+        tokens = tokenizer.tokenize(text)
+        self.assertEqual(tokens[:9],
+                         ['see', 'http', ':', '/', '/', 'www.foo.com', '/',
+                          'a' * 20, '12.5%'])
+        self.assertEqual(tokens[9:], ['a', '@'] * 2000)
+        self.assertEqual(tokenizer.guard_hits, 2)
+        self.assertEqual(tokenizer.stats.calls['long phrase guard'], 2)
+        tokenizer.tokenize(' '.join(['x' * 31] * 100))
+        self.assertEqual(tokenizer.guard_hits, 102)
+        tokenizer.tokenize_normalized('é' * 31)
+        self.assertEqual(tokenizer.guard_hits, 103)
+
+        guarded = Tokenizer(max_phrase_length=1000)
+        for text in self.get_random_text(500):
+            self.assertEqual(guarded.tokenize(text),
+                             self.tokenizer.tokenize(text))
+        self.assertEqual(guarded.guard_hits, 0)
+
+    @staticmethod
+    def get_random_text(size, seed=42):
+        pieces = ['a', 'Bc', 'de', 'XYZ', 'ex', 'PME', '1', '23', '2019',
+                  '1st', '%', '.', '..', ',', ':', ';', '/', '\\', '-',
+                  '–', '@', '#', '(', ')', '"', "'", '!', '?', '*', '+',
+                  '•', '…', 'http://', 'www.', '.com', 'é', 'kg', 'Aug.',
+                  'B.V.', '-----', ' ', ' ', '\n']
+        generator = random.Random(seed)
+        return [''.join(generator.choice(pieces)
+                        for _ in range(generator.randint(1, 40)))
+                for _ in range(size)]
+
     @staticmethod
     def get_url_text():
         text = ['''REFERENCES http://www.erdfdistribution.fr
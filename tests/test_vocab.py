@@ -0,0 +1,78 @@
+# -*coding: utf-8 -*-
+from unittest import TestCase
+from array import array
+import os
+import tempfile
+from easy_tokenizer.tokenizer import Tokenizer
+from easy_tokenizer.vocab import (Vocabulary, build_vocabulary,
+                                  load_vocabulary)
+
+
+class VocabTestCases(TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+        self.corpus = ['the cat, the dog and the bird.',
+                       'über e-mail foo@bar.com, 12.5% of the dog.']
+
+    def test_build_vocabulary(self):
+        vocab = build_vocabulary(self.tokenizer, self.corpus, min_count=2)
+        self.assertEqual(vocab.tokens,
+                         ['<unk>', 'the', ',', '.', 'dog'])
+        self.assertEqual(list(vocab.encode(['the', 'cat', 'dog'])),
+                         [1, 0, 4])
+        vocab = build_vocabulary(self.tokenizer, self.corpus, max_size=3)
+        self.assertEqual(vocab.tokens, ['<unk>', 'the', ','])
+
+    def test_encode(self):
+        vocab = build_vocabulary(self.tokenizer, self.corpus[:1])
+        text = 'the bird and the fish.'
+        ids = self.tokenizer.encode(text, vocab)
+        self.assertIsInstance(ids, array)
+        self.assertEqual(ids.typecode, 'I')
+        self.assertEqual(list(ids),
+                         list(vocab.encode(self.tokenizer.tokenize(text))))
+        self.assertEqual(vocab.decode(ids),
+                         ['the', 'bird', 'and', 'the', '<unk>', '.'])
+
+    def test_save_and_load(self):
+        vocab = build_vocabulary(self.tokenizer, self.corpus)
+        vocab = Vocabulary(vocab.tokens + ['tok{}'.format(index)
+                                           for index in range(1000)])
+        words = vocab.tokens + ['cow', 'Über', '']
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'vocab.bin')
+            vocab.save(path)
+            with load_vocabulary(path) as mapped:
+                self.assertEqual(len(mapped), len(vocab))
+                self.assertEqual(mapped.unknown, '<unk>')
+                self.assertEqual(list(mapped.encode(words)),
+                                 list(vocab.encode(words)))
+                self.assertEqual(mapped.decode(range(len(vocab))),
+                                 vocab.tokens)
+                self.assertIn('über', mapped)
+                self.assertNotIn('cow', mapped)
+                text = ' '.join(self.corpus) + ' cow'
+                self.assertEqual(self.tokenizer.encode(text, mapped),
+                                 self.tokenizer.encode(text, vocab))
+
+            with load_vocabulary(path, cache_size=16) as mapped:
+                self.assertEqual(list(mapped.encode(words)),
+                                 list(vocab.encode(words)))
+                self.assertEqual(mapped._cached_search.cache_info().currsize,
+                                 16)
+
+            with open(path, 'rb') as input_f:
+                data = input_f.read()
+            # truncated in the header, the table, the offsets and the blob
+            for size in [0, 8, 20, len(data) - 3 - 4 * len(vocab),
+                         len(data) - 1]:
+                with open(path, 'wb') as output_f:
+                    output_f.write(data[:size])
+                with self.assertRaisesRegex(ValueError,
+                                            'not a vocabulary file'):
+                    load_vocabulary(path)
+
+            with open(path, 'wb') as output_f:
+                output_f.write(b'\0' * 32)
+            with self.assertRaises(ValueError):
+                load_vocabulary(path)